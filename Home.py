@@ -1,5 +1,7 @@
 import streamlit as st
 
+from src.config import RULES_VERSION
+
 st.set_page_config(page_title="Home | IPL Strategy Dashboard", layout="wide")
 
 # ------------------------------------------------------------
@@ -146,6 +148,10 @@ We use 0-based `over_number` from the dataset:
 - **Death** = 15–19 (Overs 16–20)
         """
     )
+    st.caption(
+        f"Rules version {RULES_VERSION}: these rules live in src/config.py and are baked into "
+        "the ball dataset as precomputed flag columns."
+    )
 
 
 st.caption("✅ Home page intentionally minimal. Use sidebar tabs to explore insights.")
@@ -0,0 +1,283 @@
+# src/bench_pages.py
+"""
+Headless page benchmark for pages 1–5 (run from the repo root).
+
+    python -m src.bench_pages                               # full sweep, every page
+    python -m src.bench_pages --pages 4 5 --seasons all 2024
+    python -m src.bench_pages --compare reports/benchmarks/pages_<commit>.json
+
+Drives each page with streamlit.testing.v1.AppTest (no browser, no server) and
+sweeps its filters: Region (All / India / Overseas) x Season (All Time / each
+season) x Show Top (5 / 10). For every combination it records
+
+    render_s        page rerun after the filter change (lazy sections collapsed)
+    full_render_s   page rerun with every lazy section (src.ui.lazy_section) switched on
+    sections        rerun time per "Rank by" option, per section widget key
+
+plus, per page, the cold first run (data loading included) and the peak RSS.
+Each page runs in a fresh worker process, so cold times and peak RSS are per page.
+
+AppTest reruns the whole script on a widget change (fragments are not rerun on
+their own), so a section's time is the page rerun after changing that section's
+"Rank by": the other sections are memo-cache hits, which leaves that section's
+compute plus the page's render overhead.
+
+Results go to reports/benchmarks/pages_<commit>.json (--out to override);
+--compare prints the median change per page and per section against an
+earlier baseline.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from src.data_loader import BASE_DIR
+
+PAGES_DIR = BASE_DIR / "pages"
+BENCH_DIR = BASE_DIR / "reports" / "benchmarks"
+
+REGIONS = ["All", "India", "Overseas"]
+TOP_CHOICES = [5, 10]
+LAZY_KEY_PREFIX = "lazy_"
+RUN_TIMEOUT = 300
+
+
+def page_files() -> dict:
+    """Page number -> page script (pages/1_*.py ... pages/5_*.py)."""
+    return {int(p.name.split("_", 1)[0]): p for p in sorted(PAGES_DIR.glob("[1-5]_*.py"))}
+
+
+def _peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows: no resource module, psutil keeps the peak working set
+        import psutil
+
+        return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10, 1)
+
+
+def _timed_run(at) -> float:
+    t0 = time.perf_counter()
+    at.run(timeout=RUN_TIMEOUT)
+    return round(time.perf_counter() - t0, 4)
+
+
+def _filter(at, word):
+    """Page filter selectbox by the last word of its label (filters carry no keys)."""
+    return next((w for w in at.selectbox if w.label.split()[-1] == word), None)
+
+
+def _select(widget, match) -> bool:
+    """Select the first option equal to (or, for regions, containing) `match`; False if absent."""
+    for i, opt in enumerate(widget.options):
+        if opt == str(match) or (isinstance(match, str) and match != "All" and match in opt):
+            widget.select_index(i)
+            return True
+    if match == "All":
+        widget.select_index(0)
+        return True
+    return False
+
+
+def _set_lazy(at, on: bool) -> bool:
+    toggles = [t for t in at.toggle if (t.key or "").startswith(LAZY_KEY_PREFIX) and t.value != on]
+    for t in toggles:
+        t.set_value(on)
+    return bool(toggles)
+
+
+def _section_sweep(at) -> dict:
+    """Rerun time for every non-current option of each section's "Rank by" (by widget key), then restore it."""
+    out = {}
+    keys = [w.key for w in at.selectbox if w.label.endswith("Rank by") and w.key]
+    for key in keys:
+        widget = at.selectbox(key=key)
+        current, options = widget.index, widget.options
+        times = {}
+        for i, opt in enumerate(options):
+            if i != current:
+                at.selectbox(key=key).select_index(i)
+                times[opt] = _timed_run(at)
+        at.selectbox(key=key).select_index(current)
+        at.run(timeout=RUN_TIMEOUT)
+        out[key] = times
+    return out
+
+
+def bench_page(path, seasons=None, sections=True) -> dict:
+    """Sweep one page's filter combinations; seasons=None means All Time + every season."""
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(path), default_timeout=RUN_TIMEOUT)
+    cold_s = _timed_run(at)
+    # the first run re-reads the config (log level included): quiet the repeated deprecation notices after it
+    set_log_level("error")
+    runs, exceptions = [], [e.message for e in at.exception]
+
+    for region in REGIONS:
+        region_box = _filter(at, "Region")
+        if region_box is None or not _select(region_box, region):
+            continue
+        at.run(timeout=RUN_TIMEOUT)
+
+        season_box = _filter(at, "Season")
+        options = season_box.options if season_box is not None else ["All"]
+        wanted = [o for o in options if seasons is None or o in seasons or (o == options[0] and "all" in seasons)]
+
+        for season in wanted:
+            for top in TOP_CHOICES:
+                if season_box is not None:
+                    _select(_filter(at, "Season"), season)
+                top_box = _filter(at, "Top")
+                if top_box is not None:
+                    _select(top_box, top)
+                elif top != TOP_CHOICES[0]:
+                    continue  # page has no Top N filter: one run per season
+
+                run = {"region": region, "season": season, "top": top if top_box is not None else None}
+                run["render_s"] = _timed_run(at)
+                run["full_render_s"] = _timed_run(at) if _set_lazy(at, True) else run["render_s"]
+                if sections:
+                    run["sections"] = _section_sweep(at)
+                if _set_lazy(at, False):
+                    at.run(timeout=RUN_TIMEOUT)
+                exceptions += [e.message for e in at.exception]
+                runs.append(run)
+
+    return {
+        "file": path.name,
+        "cold_s": cold_s,
+        "peak_rss_mb": _peak_rss_mb(),
+        "runs": runs,
+        "exceptions": sorted(set(exceptions)),
+        "summary": summarize(runs, cold_s),
+    }
+
+
+def summarize(runs, cold_s) -> dict:
+    def med(values):
+        return round(statistics.median(values), 4) if values else None
+
+    per_section = {}
+    for run in runs:
+        for key, times in run.get("sections", {}).items():
+            per_section.setdefault(key, []).extend(times.values())
+    return {
+        "cold_s": cold_s,
+        "render_s_median": med([r["render_s"] for r in runs]),
+        "render_s_max": max((r["render_s"] for r in runs), default=None),
+        "full_render_s_median": med([r["full_render_s"] for r in runs]),
+        "section_s_median": {key: med(times) for key, times in per_section.items()},
+    }
+
+
+def _git_commit() -> str:
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BASE_DIR,
+                               capture_output=True, text=True).stdout.strip()
+        return sha + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "nogit"
+
+
+def run_benchmark(pages=None, seasons=None, sections=True) -> dict:
+    import streamlit
+
+    files = page_files()
+    pages = pages or sorted(files)
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "seasons": seasons or "all",
+            "sections": sections,
+        },
+        "pages": {},
+    }
+    # one fresh process per page: cold start and peak RSS are not shared between pages
+    ctx = mp.get_context("spawn")
+    for n in pages:
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            page = ex.submit(bench_page, files[n], seasons, sections).result()
+        result["pages"][files[n].name] = page
+        s = page["summary"]
+        print(f"✅ {files[n].name}: {len(page['runs'])} runs, cold {s['cold_s']:.2f}s, "
+              f"render p50 {s['render_s_median']}s, peak RSS {page['peak_rss_mb']} MB "
+              f"({time.perf_counter() - t0:.0f}s)")
+        for msg in page["exceptions"]:
+            print(f"⚠️ {files[n].name}: {msg}")
+    return result
+
+
+def _pct(old, new) -> str:
+    if not old or new is None:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(baseline: dict, current: dict):
+    """Print the change of every summary number (current vs baseline)."""
+    print(f"Baseline {baseline['meta']['commit']}  ->  current {current['meta']['commit']}")
+    for name, page in current["pages"].items():
+        old = baseline["pages"].get(name)
+        if old is None:
+            print(f"{name}: not in baseline")
+            continue
+        o, c = old["summary"], page["summary"]
+        print(name)
+        for key in ["cold_s", "render_s_median", "render_s_max", "full_render_s_median"]:
+            print(f"  {key:<22} {o.get(key)} -> {c.get(key)}  ({_pct(o.get(key), c.get(key))})")
+        print(f"  {'peak_rss_mb':<22} {old['peak_rss_mb']} -> {page['peak_rss_mb']}  "
+              f"({_pct(old['peak_rss_mb'], page['peak_rss_mb'])})")
+        for key, t in c["section_s_median"].items():
+            t_old = o["section_s_median"].get(key)
+            print(f"  section {key:<14} {t_old} -> {t}  ({_pct(t_old, t)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pages 1–5 headlessly (streamlit AppTest).")
+    parser.add_argument("--pages", nargs="+", type=int, choices=[1, 2, 3, 4, 5], help="Pages to run (default: all).")
+    parser.add_argument(
+        "--seasons", nargs="+", metavar="SEASON",
+        help='Season options to sweep, e.g. "all 2024" ("all" = All Time; default: All Time + every season).',
+    )
+    parser.add_argument("--no-sections", action="store_true", help='Skip the per-section "Rank by" sweep.')
+    parser.add_argument("--out", help="Output JSON (default: reports/benchmarks/pages_<commit>.json).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline JSON to compare the new results against.")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    result = run_benchmark(args.pages, args.seasons, sections=not args.no_sections)
+
+    out = args.out or BENCH_DIR / f"pages_{result['meta']['commit']}.json"
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=1, ensure_ascii=False)
+    print(f"✅ Wrote {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+# src/build_dataset.py
+"""
+Offline export steps for data/processed_new (run from the repo root).
+
+    python -m src.build_dataset
+
+Writes master2 as a hive-partitioned parquet dataset, with the locked-rule ball
+flags (is_legal_ball, is_dot_ball, phase, ...) stored as extra columns, so the
+loader reads only the partitions matching the Region + Season filter:
+
+    data/processed_new/master2_balls_partitioned/season_id=2008/venue_region=India/part-0.parquet
+
+Packs every CSV under data/ into one memory-mappable Arrow bundle, so load_csv()
+serves KPI tables without opening or parsing the CSVs:
+
+    data/processed_new/kpi_bundle.arrow
+
+Materializes the innings and over fact tables:
+
+    data/processed_new/master_innings.parquet     one row per match + innings
+    data/processed_new/master_overs.parquet       one row per match + innings + over (+ bowler)
+
+Writes the bowler dimension (bowler_type -> spin / pace, finger / wrist, left / right arm):
+
+    data/processed_new/dim_bowlers.parquet
+
+Builds the batting / bowling aggregate cubes (see src/cube.py):
+
+    data/processed_new/cube_batting.parquet
+    data/processed_new/cube_bowling.parquet
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.data_loader import (
+    BALLS_PARQUET,
+    BALLS_PARTITIONED_DIR,
+    BALL_PARTITIONING,
+    BALL_RULES_VERSION_KEY,
+    BOWLERS_PARQUET,
+    DATA_DIR,
+    DATA_ROOT,
+    INNINGS_PARQUET,
+    OVERS_PARQUET,
+    KPI_BUNDLE,
+    KPI_BUNDLE_MAGIC,
+    _apply_ball_schema,
+    _ball_frame,
+    add_ball_flags,
+    build_bowler_dim,
+    _file_digest,
+)
+from src.build_kpis import MATCH_BASE_CSV
+from src.config import PHASES, RULES_VERSION
+from src.cube import CUBES, export_cube
+
+BUNDLE_ALIGN = 64
+
+# master2 columns read for the innings / over fact tables
+FACT_BALL_COLUMNS = [
+    "match_id", "innings", "season_id", "match_date", "venue", "venue_region",
+    "team_batting", "team_bowling", "over_number", "bowler",
+    "batter_runs", "extras", "total_runs", "is_wicket",
+    "is_wide_ball", "is_no_ball",
+    "wide_ball_runs", "no_ball_runs", "leg_bye_runs", "bye_runs", "penalty_runs",
+]
+
+
+def export_partitioned_balls(src=BALLS_PARQUET, out_dir=BALLS_PARTITIONED_DIR):
+    """
+    Re-write the single master2 parquet file as season_id= / venue_region= partitions.
+    The output is written to a temp folder first and swapped in at the end,
+    so a running app never sees a half-written dataset.
+
+    The derived ball flags (BALL_FLAG_COLUMNS) are computed here and the files
+    are stamped with the RULES_VERSION they were derived with.
+    """
+    table = add_ball_flags(_apply_ball_schema(pq.read_table(src)))
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), BALL_RULES_VERSION_KEY: str(RULES_VERSION).encode()}
+    )
+
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+
+    ds.write_dataset(
+        table,
+        tmp_dir,
+        format="parquet",
+        partitioning=BALL_PARTITIONING,
+        basename_template="part-{i}.parquet",
+    )
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    tmp_dir.rename(out_dir)
+
+    return out_dir
+
+
+def _team_names() -> dict:
+    """team_id -> canonical team name (master3 + alias table), as used in master2."""
+    teams = pd.read_csv(DATA_DIR / "master3_teams.csv")
+    aliases = pd.read_csv(DATA_DIR / "master_team_aliases.csv")
+    names = dict(zip(teams["team_id"], teams["team_name"]))
+    names.update(zip(aliases["team_id"], aliases["canonical_team_name"]))
+    return names
+
+
+def _read_fact_balls() -> pd.DataFrame:
+    """master2 with super overs removed, FACT_BALL_COLUMNS only."""
+    return _ball_frame(
+        ds.dataset(BALLS_PARQUET, format="parquet").to_table(
+            columns=FACT_BALL_COLUMNS, filter=ds.field("is_super_over") == False
+        )
+    )
+
+
+def build_master_innings(balls=None, match_base=None) -> pd.DataFrame:
+    """
+    One row per (match_id, innings) of master2, super overs excluded.
+
+    balls / over_balls: every delivery / deliveries that count toward the over (no wides, no no-balls;
+    not the locked-rule is_legal_ball, which only excludes wides).
+    over_ball_runs: total runs scored off over_balls only.
+    target: first-innings total + 1 on the second innings (not revised for rain rules).
+    result: won / lost / tie / no result, from the batting team's point of view.
+    """
+    if balls is None:
+        balls = _read_fact_balls()
+    if match_base is None:
+        match_base = pd.read_csv(MATCH_BASE_CSV, usecols=["match_id", "match_winner", "result"])
+
+    over = balls["over_number"]
+    over_ball = ~(balls["is_wide_ball"] | balls["is_no_ball"])
+    b = balls.assign(
+        over_ball=over_ball,
+        over_ball_runs=balls["total_runs"].where(over_ball, 0),
+        is_four=balls["batter_runs"] == 4,
+        is_six=balls["batter_runs"] == 6,
+        is_dot=balls["total_runs"] == 0,
+        **{
+            f"{phase.lower()}_runs": balls["total_runs"].where(over.between(lo, hi), 0)
+            for phase, (lo, hi) in PHASES.items()
+        },
+    )
+
+    keys = ["match_id", "innings"]
+    inns = (
+        b.groupby(keys, as_index=False, observed=True)
+        .agg(
+            season_id=("season_id", "first"),
+            match_date=("match_date", "first"),
+            venue=("venue", "first"),
+            venue_region=("venue_region", "first"),
+            team_batting=("team_batting", "first"),
+            team_bowling=("team_bowling", "first"),
+            total_runs=("total_runs", "sum"),
+            batter_runs=("batter_runs", "sum"),
+            extras=("extras", "sum"),
+            balls=("match_id", "size"),
+            over_balls=("over_ball", "sum"),
+            over_ball_runs=("over_ball_runs", "sum"),
+            wickets=("is_wicket", "sum"),
+            dots=("is_dot", "sum"),
+            fours=("is_four", "sum"),
+            sixes=("is_six", "sum"),
+            wide_runs=("wide_ball_runs", "sum"),
+            noball_runs=("no_ball_runs", "sum"),
+            legbye_runs=("leg_bye_runs", "sum"),
+            bye_runs=("bye_runs", "sum"),
+            penalty_runs=("penalty_runs", "sum"),
+            **{f"{phase.lower()}_runs": (f"{phase.lower()}_runs", "sum") for phase in PHASES},
+        )
+    )
+    for col in ["match_date", "venue", "venue_region", "team_batting", "team_bowling"]:
+        inns[col] = inns[col].astype(str)
+
+    # ---------------- Target (second innings) ----------------
+    first = inns.loc[inns["innings"] == 1, ["match_id", "total_runs"]]
+    inns = inns.merge(first.rename(columns={"total_runs": "first_innings_runs"}), on="match_id", how="left")
+    inns["target"] = (inns["first_innings_runs"] + 1).where(inns["innings"] == 2).astype("Int32")
+    inns = inns.drop(columns="first_innings_runs")
+
+    # ---------------- Result (batting team's view) ----------------
+    base = match_base.assign(match_winner=match_base["match_winner"].map(_team_names()))
+    inns = inns.merge(base[["match_id", "match_winner", "result"]], on="match_id", how="left")
+    inns["result"] = np.select(
+        [
+            inns["result"] == "win",
+            inns["result"].isin(["tie", "no result"]),
+        ],
+        [
+            np.where(inns["match_winner"] == inns["team_batting"], "won", "lost"),
+            inns["result"],
+        ],
+        default=None,
+    )
+
+    int_cols = [c for c in inns.columns if pd.api.types.is_integer_dtype(inns[c]) and c != "target"]
+    inns[int_cols] = inns[int_cols].astype("int32")
+    return inns.sort_values(keys, ignore_index=True)
+
+
+def build_master_overs(balls=None) -> pd.DataFrame:
+    """
+    One row per (match_id, innings, over_number, bowler) of master2, super overs excluded.
+    An over finished by a second bowler (injury, suspension) gets one row per bowler.
+
+    Ball counts follow master_innings (balls = every delivery, over_balls = no wides / no-balls);
+    dots / fours / sixes are counted on every delivery (total_runs == 0, batter_runs == 4 / 6).
+    phase is an ordered categorical (Powerplay < Middle < Death).
+    cum_runs / cum_wickets: innings score at the end of the row (worm charts).
+    """
+    if balls is None:
+        balls = _read_fact_balls()
+
+    b = balls.assign(
+        over_ball=~(balls["is_wide_ball"] | balls["is_no_ball"]),
+        is_dot=balls["total_runs"] == 0,
+        is_four=balls["batter_runs"] == 4,
+        is_six=balls["batter_runs"] == 6,
+    )
+
+    keys = ["match_id", "innings", "over_number", "bowler"]
+    overs = (
+        b.groupby(keys, as_index=False, observed=True)
+        .agg(
+            season_id=("season_id", "first"),
+            venue_region=("venue_region", "first"),
+            team_batting=("team_batting", "first"),
+            team_bowling=("team_bowling", "first"),
+            balls=("match_id", "size"),
+            over_balls=("over_ball", "sum"),
+            runs=("total_runs", "sum"),
+            batter_runs=("batter_runs", "sum"),
+            extras=("extras", "sum"),
+            wide_runs=("wide_ball_runs", "sum"),
+            noball_runs=("no_ball_runs", "sum"),
+            wickets=("is_wicket", "sum"),
+            dots=("is_dot", "sum"),
+            fours=("is_four", "sum"),
+            sixes=("is_six", "sum"),
+        )
+    )
+    for col in ["bowler", "venue_region", "team_batting", "team_bowling"]:
+        overs[col] = overs[col].astype(str)
+
+    over = overs["over_number"]
+    overs["phase"] = pd.Categorical(
+        np.select([over.between(lo, hi) for lo, hi in PHASES.values()], list(PHASES), default=None),
+        categories=list(PHASES),
+        ordered=True,
+    )
+
+    # rows of one over are ordered by bowler name, not by ball: cumulative totals are per over-end
+    overs = overs.sort_values(keys, ignore_index=True)
+    by_innings = overs.groupby(["match_id", "innings"], sort=False)
+    overs["cum_runs"] = by_innings["runs"].cumsum()
+    overs["cum_wickets"] = by_innings["wickets"].cumsum()
+
+    int_cols = [c for c in overs.columns if pd.api.types.is_integer_dtype(overs[c])]
+    overs[int_cols] = overs[int_cols].astype("int32")
+    return overs
+
+
+def _write_parquet(df, out_path):
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, out_path)
+    return out_path, len(df)
+
+
+def export_master_innings(out_path=INNINGS_PARQUET, balls=None):
+    return _write_parquet(build_master_innings(balls), out_path)
+
+
+def export_master_overs(out_path=OVERS_PARQUET, balls=None):
+    return _write_parquet(build_master_overs(balls), out_path)
+
+
+def export_bowler_dim(out_path=BOWLERS_PARQUET, src=BALLS_PARQUET):
+    """Bowler dimension (data_loader.build_bowler_dim) over every delivery of master2."""
+    balls = _ball_frame(pq.read_table(src, columns=["bowler", "bowler_type"]))
+    return _write_parquet(build_bowler_dim(balls), out_path)
+
+
+def export_kpi_bundle(src_root=DATA_ROOT, out_path=KPI_BUNDLE):
+    """
+    Pack every CSV under data/ into one Arrow IPC bundle with a table of contents
+    (layout documented next to _open_kpi_bundle in src/data_loader.py).
+    Tables are parsed with pd.read_csv, so the loader returns exactly what load_csv would.
+    """
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    toc = {}
+
+    with open(tmp_path, "wb") as f:
+        for path in sorted(src_root.rglob("*.csv")):
+            df = pd.read_csv(path)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            blob = sink.getvalue()
+
+            offset = f.tell()
+            f.write(blob)
+            f.write(b"\0" * (-f.tell() % BUNDLE_ALIGN))
+
+            toc[path.relative_to(src_root).as_posix()] = {
+                "offset": offset,
+                "length": blob.size,
+                "size": path.stat().st_size,
+                "digest": _file_digest(path),
+                "rows": table.num_rows,
+                "columns": table.column_names,
+            }
+
+        toc_bytes = json.dumps({"version": 1, "tables": toc}).encode("utf-8")
+        f.write(toc_bytes)
+        f.write(len(toc_bytes).to_bytes(8, "little"))
+        f.write(KPI_BUNDLE_MAGIC)
+
+    os.replace(tmp_path, out_path)
+    return out_path, len(toc)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Export master2 as a season/region partitioned parquet dataset, "
+            "pack all CSVs into the KPI bundle and build the innings / over tables, "
+            "the bowler dimension and aggregate cubes."
+        )
+    )
+    parser.parse_args()
+
+    out_dir = export_partitioned_balls()
+    n_files = len(list(out_dir.rglob("*.parquet")))
+    print(f"✅ Wrote {n_files} partitions -> {out_dir}")
+
+    out_path, n_tables = export_kpi_bundle()
+    print(f"✅ Wrote {n_tables} tables -> {out_path}")
+
+    balls = _read_fact_balls()
+    out_path, n_rows = export_master_innings(balls=balls)
+    print(f"✅ Wrote {n_rows:,} innings -> {out_path}")
+    out_path, n_rows = export_master_overs(balls=balls)
+    print(f"✅ Wrote {n_rows:,} overs -> {out_path}")
+    out_path, n_rows = export_bowler_dim()
+    print(f"✅ Wrote {n_rows:,} bowlers -> {out_path}")
+
+    for name in CUBES:
+        out_path, n_rows = export_cube(name)
+        print(f"✅ Wrote {name} cube ({n_rows:,} rows) -> {out_path}")
+
+
+if __name__ == "__main__":
+    main()
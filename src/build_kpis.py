@@ -0,0 +1,813 @@
+# src/build_kpis.py
+"""
+Offline KPI build for data/processed_new (run from the repo root).
+
+    python -m src.build_kpis                          # every KPI file, from full history
+    python -m src.build_kpis --only kpi_player_batting_alltime venue_most_used
+    python -m src.build_kpis --jobs 4                 # independent outputs in parallel
+    python -m src.build_kpis --incremental            # fold only new matches into the stored counters
+
+Reads master2 once (plus the match base table for toss/result fields),
+rebuilds every KPI file listed in DATA_CONTRACT.md sections 6, 7 and the
+Tab 3 venue KPIs and the fact tables below from that one read, and writes
+each one atomically (temp file + rename), so the app never reads a
+half-written CSV. The KPI bundle is refreshed at the end.
+
+Every output is kept as additive base counters per key (runs, balls,
+legal balls, outs/wickets, dots, 4s, 6s, matches, ...) in
+data/processed_new/kpi_state/<name>.parquet, together with the match_ids
+already folded in. --incremental reads only matches not yet in that list,
+adds their counters, and recomputes the derived ratios for the affected
+keys only.
+
+It also writes the player-innings fact tables (FACT_OUTPUTS:
+batter_innings, bowler_innings, bowler_spells under data/processed_new/). --incremental appends the
+rows of matches not yet in a table.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import PHASES
+from src.data_loader import (
+    BATTER_INNINGS_PARQUET,
+    BOWLER_INNINGS_PARQUET,
+    BOWLER_SPELLS_PARQUET,
+    DATA_DIR,
+    DATA_ROOT,
+    read_ball_frame,
+)
+
+MATCH_BASE_CSV = DATA_ROOT / "KPIs" / "master_kpis" / "matches" / "phase2_match_base_all_venues.csv"
+VENUE_MAP_CSV = DATA_DIR / "venue_cleanup_map.csv"
+KPI_STATE_DIR = DATA_DIR / "kpi_state"
+
+KPI_BALL_COLUMNS = [
+    "match_id", "season_id", "innings", "over_number",
+    "batter", "bowler", "team_batting", "team_bowling",
+    "batter_runs", "total_runs", "is_wicket", "wicket_kind",
+    "is_super_over", "venue",
+    # locked-rule flags, stored in the ball dataset (src/config.py)
+    "is_legal_ball", "is_dot_ball", "is_four", "is_six", "is_bowler_wicket",
+]
+
+# ---------------- Locked rules (match the published KPI files) ----------------
+# Player leaderboards: minimum sample per row
+MIN_BAT_BALLS_ALLTIME = 250
+MIN_BAT_BALLS_SEASON = 150
+MIN_BOWL_BALLS_ALLTIME = 450
+MIN_BOWL_WKTS_ALLTIME = 25
+MIN_BOWL_BALLS_SEASON = 225
+MIN_BOWL_WKTS_SEASON = 12
+
+# Team bowling wickets: the locked bowler-wicket flag, minus these kinds as well
+TEAM_EXTRA_NOT_BOWLER_WKTS = {"retired out"}
+
+PHASE_BINS = [-1, 5, 14, 19]
+PHASE_LABELS = ["Powerplay (0-5)", "Middle (6-14)", "Death (15-19)"]
+
+
+# ---------------- Inputs ----------------
+_INPUTS = None
+
+
+def _clean_venue(s: pd.Series) -> pd.Series:
+    vmap = pd.read_csv(VENUE_MAP_CSV)
+    venue_map = dict(zip(vmap["venue_raw"], vmap["venue_clean"]))
+    s = s.astype(str).str.strip()
+    return s.map(venue_map).fillna(s)
+
+
+def read_inputs(ball_match_ids=None, base_match_ids=None) -> dict:
+    """
+    master2 (super overs removed) + match base, with venues cleaned the same way as Tab 3,
+    and the fact-table balls (delivery order, super overs kept) from the same master2 read.
+    Passing match_id sets restricts the read to those matches (pushed down into the parquet scan).
+    """
+    filters = {"match_id": sorted(ball_match_ids)} if ball_match_ids is not None else None
+    columns = KPI_BALL_COLUMNS + [c for c in FACT_BALL_COLUMNS if c not in KPI_BALL_COLUMNS]
+    raw = read_ball_frame(columns, filters)
+    fact_balls = raw[FACT_BALL_COLUMNS].sort_values(
+        ["match_id", "innings", "over_number", "ball_number"], kind="stable", ignore_index=True
+    )
+    balls = raw.loc[~raw["is_super_over"], KPI_BALL_COLUMNS].reset_index(drop=True)
+    balls["venue"] = _clean_venue(balls["venue"])
+    balls["phase"] = pd.cut(balls["over_number"], bins=PHASE_BINS, labels=PHASE_LABELS).astype(str)
+
+    matches = pd.read_csv(MATCH_BASE_CSV)
+    if base_match_ids is not None:
+        matches = matches[matches["match_id"].isin(base_match_ids)].reset_index(drop=True)
+    matches["venue"] = _clean_venue(matches["venue"])
+
+    return {"balls": balls, "fact_balls": fact_balls, "matches": matches}
+
+
+def ball_match_ids() -> set:
+    """match_ids in the ball dataset the builds read (incremental runs fold the missing ones)."""
+    return set(read_ball_frame(["match_id"])["match_id"].unique().tolist())
+
+
+def load_inputs() -> dict:
+    """Full-history inputs, read once per process."""
+    global _INPUTS
+    if _INPUTS is None:
+        _INPUTS = read_inputs()
+    return _INPUTS
+
+
+# ---------------- Additive counters ----------------
+# Every counter is a sum (or a distinct count over disjoint matches), so the
+# counters of old + new matches are simply added key by key.
+def _ball_counters(balls, keys):
+    df = balls.assign(
+        is_team_bowler_wicket=balls["is_bowler_wicket"]
+        & ~balls["wicket_kind"].str.lower().isin(TEAM_EXTRA_NOT_BOWLER_WKTS),
+    )
+    return (
+        df.groupby(keys, as_index=False, observed=True)
+        .agg(
+            balls=("match_id", "size"),
+            legal_balls=("is_legal_ball", "sum"),
+            batter_runs=("batter_runs", "sum"),
+            total_runs=("total_runs", "sum"),
+            wickets=("is_wicket", "sum"),
+            bowler_wickets=("is_team_bowler_wicket", "sum"),
+            dots=("is_dot_ball", "sum"),
+            fours=("is_four", "sum"),
+            sixes=("is_six", "sum"),
+            matches=("match_id", "nunique"),
+        )
+    )
+
+
+def _phase_counters(balls, keys):
+    per_innings = (
+        balls.groupby(["match_id", "innings"] + keys, as_index=False, observed=True)["total_runs"].sum()
+    )
+    return (
+        per_innings.groupby(keys, as_index=False)
+        .agg(runs=("total_runs", "sum"), n_innings=("total_runs", "size"))
+    )
+
+
+def _innings_counters(balls, keys):
+    per_innings = (
+        balls[balls["innings"].isin([1, 2])]
+        .groupby(["match_id"] + keys, as_index=False, observed=True)["total_runs"]
+        .sum()
+    )
+    return (
+        per_innings.groupby(keys, as_index=False)
+        .agg(runs=("total_runs", "sum"), n_innings=("total_runs", "size"))
+    )
+
+
+def _match_counters(matches, keys):
+    return (
+        matches.assign(
+            chase_win=matches["match_winner"] == matches["team_bowling"],
+            defend_win=matches["match_winner"] == matches["team_batting"],
+            toss_win_match=matches["toss_winner"] == matches["match_winner"],
+            chose_field=matches["toss_decision"] == "field",
+            chose_bat=matches["toss_decision"] == "bat",
+        )
+        .groupby(keys, as_index=False)
+        .agg(
+            matches=("match_id", "nunique"),
+            chase_wins=("chase_win", "sum"),
+            defend_wins=("defend_win", "sum"),
+            toss_win_matches=("toss_win_match", "sum"),
+            field_first=("chose_field", "sum"),
+            bat_first=("chose_bat", "sum"),
+        )
+    )
+
+
+# ---------------- Derived ratios (row-wise, recomputed for affected keys) ----------------
+def _derive_player_batting(s):
+    return pd.DataFrame({
+        "strike_rate": s["batter_runs"] / s["balls"] * 100,
+        "average": s["batter_runs"] / s["wickets"].replace(0, np.nan),
+    }, index=s.index)
+
+
+def _derive_player_bowling(s):
+    overs = s["balls"] / 6
+    wickets = s["wickets"].replace(0, np.nan)
+    return pd.DataFrame({
+        "overs": overs,
+        "economy": s["total_runs"] / overs,
+        "strike_rate": s["balls"] / wickets,
+        "average": s["total_runs"] / wickets,
+    }, index=s.index)
+
+
+def _derive_team_batting(s):
+    return pd.DataFrame({"run_rate": (s["total_runs"] / s["balls"] * 6).round(2)}, index=s.index)
+
+
+def _derive_team_bowling(s):
+    return pd.DataFrame({
+        "overs": (s["balls"] / 6).round(1),
+        "economy": (s["total_runs"] / (s["balls"] / 6)).round(2),
+        "strike_rate": (s["balls"] / s["bowler_wickets"].replace(0, np.nan)).round(2),
+    }, index=s.index)
+
+
+def _derive_venue_bias(s):
+    chase = s["chase_wins"] / s["matches"]
+    defend = s["defend_wins"] / s["matches"]
+    return pd.DataFrame({
+        "chase_win_rate": chase,
+        "defend_win_rate": defend,
+        "bias": (chase - defend) * 100,
+    }, index=s.index)
+
+
+def _derive_venue_toss(s):
+    field = s["field_first"] / s["matches"]
+    bat = s["bat_first"] / s["matches"]
+    return pd.DataFrame({
+        "toss_win_match_rate": s["toss_win_matches"] / s["matches"],
+        "field_rate": field,
+        "bat_rate": bat,
+        "decision_preference_index": (field - bat) * 100,
+    }, index=s.index)
+
+
+def _derive_none(s):
+    return pd.DataFrame(index=s.index)
+
+
+def _derive_mean_runs(col):
+    def derive(s):
+        return pd.DataFrame({col: s["runs"] / s["n_innings"]}, index=s.index)
+    return derive
+
+
+# ---------------- Published files (gates + column order + sort) ----------------
+def kpi_player_batting_alltime(s):
+    s = s[s["balls"] >= MIN_BAT_BALLS_ALLTIME].rename(columns={"batter_runs": "runs", "wickets": "outs"})
+    return s.sort_values(["runs", "balls"], ascending=[False, True])[
+        ["batter", "runs", "balls", "outs", "matches", "strike_rate", "average"]
+    ]
+
+
+def kpi_player_batting_season(s):
+    s = s[s["balls"] >= MIN_BAT_BALLS_SEASON].rename(columns={"batter_runs": "runs", "wickets": "outs"})
+    return s.sort_values(["season_id", "runs"], ascending=[True, False])[
+        ["season_id", "batter", "runs", "balls", "outs", "matches", "strike_rate", "average"]
+    ]
+
+
+def kpi_player_bowling_alltime(s):
+    s = s[(s["balls"] >= MIN_BOWL_BALLS_ALLTIME) & (s["wickets"] >= MIN_BOWL_WKTS_ALLTIME)]
+    s = s.rename(columns={"total_runs": "runs_conceded"})
+    return s.sort_values(["wickets", "economy"], ascending=[False, True])[
+        ["bowler", "balls", "runs_conceded", "wickets", "matches", "overs", "economy", "strike_rate", "average"]
+    ]
+
+
+def kpi_player_bowling_season(s):
+    s = s[(s["balls"] >= MIN_BOWL_BALLS_SEASON) & (s["wickets"] >= MIN_BOWL_WKTS_SEASON)]
+    s = s.rename(columns={"total_runs": "runs_conceded"})
+    return s.sort_values(["season_id", "wickets", "economy"], ascending=[True, False, True])[
+        ["season_id", "bowler", "balls", "runs_conceded", "wickets", "matches", "overs", "economy", "strike_rate", "average"]
+    ]
+
+
+def _team_batting(s, keys):
+    return s.rename(columns={"total_runs": "runs"})[keys + ["runs", "balls", "matches", "run_rate"]]
+
+
+def _team_bowling(s, keys):
+    s = s.drop(columns="wickets").rename(columns={"total_runs": "runs_conceded", "bowler_wickets": "wickets"})
+    return s[keys + ["balls", "runs_conceded", "wickets", "matches", "overs", "economy", "strike_rate"]]
+
+
+def kpi_team_batting_alltime(s):
+    return _team_batting(s, ["team_batting"])
+
+
+def kpi_team_batting_season(s):
+    return _team_batting(s, ["season_id", "team_batting"])
+
+
+def kpi_team_bowling_alltime(s):
+    return _team_bowling(s, ["team_bowling"])
+
+
+def kpi_team_bowling_season(s):
+    return _team_bowling(s, ["season_id", "team_bowling"])
+
+
+def venue_most_used(s):
+    return s[["venue", "matches"]].sort_values("matches", ascending=False)
+
+
+def venue_chase_defend_bias(s):
+    return s[["venue", "matches", "chase_win_rate", "defend_win_rate", "bias"]]
+
+
+def venue_toss_influence(s):
+    return s[["venue", "matches", "toss_win_match_rate", "field_rate", "bat_rate", "decision_preference_index"]]
+
+
+def venue_phase_scoring(s):
+    return s[["venue", "phase", "phase_runs"]]
+
+
+def venue_avg_innings_1v2(s):
+    return s[["venue", "innings", "innings_runs"]]
+
+
+# output name -> path under data/processed_new, input ("balls" | "matches"), keys, counters, derive, publish
+KPI_OUTPUTS = {
+    "kpi_player_batting_alltime": {
+        "path": "kpi_player_batting_alltime.csv", "source": "balls", "keys": ["batter"],
+        "counters": _ball_counters, "derive": _derive_player_batting, "publish": kpi_player_batting_alltime,
+    },
+    "kpi_player_batting_season": {
+        "path": "kpi_player_batting_season.csv", "source": "balls", "keys": ["season_id", "batter"],
+        "counters": _ball_counters, "derive": _derive_player_batting, "publish": kpi_player_batting_season,
+    },
+    "kpi_player_bowling_alltime": {
+        "path": "kpi_player_bowling_alltime.csv", "source": "balls", "keys": ["bowler"],
+        "counters": _ball_counters, "derive": _derive_player_bowling, "publish": kpi_player_bowling_alltime,
+    },
+    "kpi_player_bowling_season": {
+        "path": "kpi_player_bowling_season.csv", "source": "balls", "keys": ["season_id", "bowler"],
+        "counters": _ball_counters, "derive": _derive_player_bowling, "publish": kpi_player_bowling_season,
+    },
+    "kpi_team_batting_alltime": {
+        "path": "kpi_team_batting_alltime.csv", "source": "balls", "keys": ["team_batting"],
+        "counters": _ball_counters, "derive": _derive_team_batting, "publish": kpi_team_batting_alltime,
+    },
+    "kpi_team_batting_season": {
+        "path": "kpi_team_batting_season.csv", "source": "balls", "keys": ["season_id", "team_batting"],
+        "counters": _ball_counters, "derive": _derive_team_batting, "publish": kpi_team_batting_season,
+    },
+    "kpi_team_bowling_alltime": {
+        "path": "kpi_team_bowling_alltime.csv", "source": "balls", "keys": ["team_bowling"],
+        "counters": _ball_counters, "derive": _derive_team_bowling, "publish": kpi_team_bowling_alltime,
+    },
+    "kpi_team_bowling_season": {
+        "path": "kpi_team_bowling_season.csv", "source": "balls", "keys": ["season_id", "team_bowling"],
+        "counters": _ball_counters, "derive": _derive_team_bowling, "publish": kpi_team_bowling_season,
+    },
+    "venue_most_used": {
+        "path": "tab3_venue_kpis/venue_most_used.csv", "source": "matches", "keys": ["venue"],
+        "counters": _match_counters, "derive": _derive_none, "publish": venue_most_used,
+    },
+    "venue_chase_defend_bias": {
+        "path": "tab3_venue_kpis/venue_chase_defend_bias.csv", "source": "matches", "keys": ["venue"],
+        "counters": _match_counters, "derive": _derive_venue_bias, "publish": venue_chase_defend_bias,
+    },
+    "venue_toss_influence": {
+        "path": "tab3_venue_kpis/venue_toss_influence.csv", "source": "matches", "keys": ["venue"],
+        "counters": _match_counters, "derive": _derive_venue_toss, "publish": venue_toss_influence,
+    },
+    "venue_phase_scoring": {
+        "path": "tab3_venue_kpis/venue_phase_scoring.csv", "source": "balls", "keys": ["venue", "phase"],
+        "counters": _phase_counters, "derive": _derive_mean_runs("phase_runs"), "publish": venue_phase_scoring,
+    },
+    "venue_avg_innings_1v2": {
+        "path": "tab3_venue_kpis/venue_avg_innings_1v2.csv", "source": "balls", "keys": ["venue", "innings"],
+        "counters": _innings_counters, "derive": _derive_mean_runs("innings_runs"), "publish": venue_avg_innings_1v2,
+    },
+}
+
+
+# ---------------- State (counters + folded match_ids) ----------------
+def _state_path(name: str, out_dir=DATA_DIR):
+    return out_dir / KPI_STATE_DIR.name / f"{name}.parquet"
+
+
+def _as_plain_keys(df, keys):
+    # categoricals from the ball loader -> plain values, so old and new states align
+    for k in keys:
+        if isinstance(df[k].dtype, pd.CategoricalDtype):
+            df[k] = df[k].astype(df[k].cat.categories.dtype)
+    return df
+
+
+def read_state(name: str, out_dir=DATA_DIR):
+    """(counters + derived DataFrame, set of folded match_ids), or (None, empty set) if never built."""
+    path = _state_path(name, out_dir)
+    if not path.exists():
+        return None, set()
+    table = pq.read_table(path)
+    match_ids = set(json.loads(table.schema.metadata[b"kpi_match_ids"]))
+    return table.to_pandas(), match_ids
+
+
+def write_state(name: str, state: pd.DataFrame, match_ids, out_dir=DATA_DIR) -> None:
+    table = pa.Table.from_pandas(state, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[b"kpi_match_ids"] = json.dumps(sorted(int(m) for m in match_ids)).encode("utf-8")
+    table = table.replace_schema_metadata(meta)
+
+    path = _state_path(name, out_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def fold_counters(state, delta, keys, derive):
+    """
+    Add delta counters into state and recompute derived ratios for the touched keys only.
+    Returns the new state sorted by keys.
+    """
+    counter_cols = [c for c in delta.columns if c not in keys]
+    if state is None:
+        merged = delta.copy()
+        affected = pd.Series(True, index=merged.index)
+    else:
+        counters = pd.concat([state[keys + counter_cols], delta], ignore_index=True)
+        counters = counters.groupby(keys, as_index=False)[counter_cols].sum()
+        # untouched keys keep their stored ratios
+        derived_cols = [c for c in state.columns if c not in keys and c not in counter_cols]
+        merged = counters.merge(state[keys + derived_cols], on=keys, how="left")
+        touched = merged[keys].merge(delta[keys].drop_duplicates(), on=keys, how="left", indicator=True)
+        affected = pd.Series((touched["_merge"] == "both").to_numpy(), index=merged.index)
+
+    derived = derive(merged.loc[affected])
+    for col in derived.columns:
+        if col not in merged.columns:
+            merged[col] = np.nan
+        merged.loc[affected, col] = derived[col]
+
+    return merged.sort_values(keys).reset_index(drop=True)
+
+
+# ---------------- Fact tables (one row per player innings) ----------------
+# Unlike the KPI files these keep super-over innings (flagged by is_super_over),
+# so the published Tab 4 master (which counts them) can be recomputed exactly.
+FACT_BALL_COLUMNS = [
+    "match_id", "season_id", "match_date", "venue_region", "innings", "is_super_over",
+    "team_batting", "team_bowling", "over_number", "ball_number",
+    "batter", "non_striker", "bowler",
+    "batter_runs", "total_runs", "wide_ball_runs", "no_ball_runs",
+    "is_wicket", "wicket_kind", "player_out",
+    # locked-rule flags, stored in the ball dataset (src/config.py)
+    "is_legal_ball", "is_dot_ball", "is_four", "is_six", "is_bowler_wicket", "bowler_runs_conceded",
+]
+
+# Row groups stay small so a batter / bowler filter prunes most of the file (it is sorted by player)
+FACT_ROW_GROUP_SIZE = 2048
+
+# A batter who retires hurt is not out
+NOT_OUT_KINDS = {"retired hurt"}
+
+# Bowler-innings / spell phases follow the locked rules (src/config.py), like the ball flags
+FACT_PHASES = {phase.lower(): overs for phase, overs in PHASES.items()}
+
+# A bowler's next over more than this many overs later starts a new spell
+# (bowling from one end = every second over)
+SPELL_MAX_GAP = 2
+
+
+def _innings_context(balls):
+    return balls.groupby(["match_id", "innings"], as_index=False, observed=True).agg(
+        season_id=("season_id", "first"),
+        match_date=("match_date", "first"),
+        venue_region=("venue_region", "first"),
+        is_super_over=("is_super_over", "first"),
+        team_batting=("team_batting", "first"),
+        team_bowling=("team_bowling", "first"),
+        team_runs=("total_runs", "sum"),
+    )
+
+
+def build_batter_innings(balls) -> pd.DataFrame:
+    """
+    One row per (match_id, innings, batter) for every batter who faced a delivery.
+
+    deliveries: every ball faced incl. wides (Tab 4 master rule); balls_faced: wides excluded (page rule).
+    dots / fours / sixes: legal balls only. is_out: dismissed as striker or non-striker (retired hurt = not out).
+    entry_over / position: over and order in which the batter first appeared at the crease.
+    share_of_team_runs_pct: runs / innings total (incl. extras) x 100.
+    """
+    keys = ["match_id", "innings", "batter"]
+    bi = balls.groupby(keys, as_index=False, observed=True).agg(
+        runs=("batter_runs", "sum"),
+        deliveries=("match_id", "size"),
+        balls_faced=("is_legal_ball", "sum"),
+        dots=("is_dot_ball", "sum"),
+        fours=("is_four", "sum"),
+        sixes=("is_six", "sum"),
+    )
+    bi["batter"] = bi["batter"].astype(str)
+
+    # ---------------- Entry (first appearance as striker or non-striker) ----------------
+    seq = np.arange(len(balls))
+    crease = pd.concat([
+        pd.DataFrame({"match_id": balls["match_id"], "innings": balls["innings"], "batter": balls["batter"].astype(str),
+                      "over_number": balls["over_number"], "seq": seq * 2}),
+        pd.DataFrame({"match_id": balls["match_id"], "innings": balls["innings"], "batter": balls["non_striker"].astype(str),
+                      "over_number": balls["over_number"], "seq": seq * 2 + 1}),
+    ])
+    entry = crease.sort_values("seq").drop_duplicates(keys).rename(columns={"over_number": "entry_over"})
+    entry["position"] = entry.groupby(["match_id", "innings"])["seq"].rank(method="first")
+    bi = bi.merge(entry[keys + ["entry_over", "position"]], on=keys, how="left")
+
+    # ---------------- Dismissal ----------------
+    outs = balls.loc[balls["is_wicket"] & balls["player_out"].notna(), ["match_id", "innings", "player_out", "wicket_kind"]]
+    outs = (
+        outs.rename(columns={"player_out": "batter", "wicket_kind": "dismissal_kind"})
+        .astype({"dismissal_kind": str})
+        .drop_duplicates(keys)
+    )
+    bi = bi.merge(outs, on=keys, how="left")
+    bi["is_out"] = bi["dismissal_kind"].notna() & ~bi["dismissal_kind"].isin(NOT_OUT_KINDS)
+
+    bi = _innings_context(balls).merge(bi, on=["match_id", "innings"])
+    bi["share_of_team_runs_pct"] = bi["runs"] / bi["team_runs"].replace(0, np.nan) * 100
+
+    cols = [
+        "batter", "match_id", "innings", "season_id", "match_date", "venue_region", "is_super_over",
+        "team_batting", "team_bowling", "position", "entry_over",
+        "runs", "deliveries", "balls_faced", "dots", "fours", "sixes",
+        "is_out", "dismissal_kind", "team_runs", "share_of_team_runs_pct",
+    ]
+    bi = _as_plain_keys(bi[cols], ["match_date", "venue_region", "team_batting", "team_bowling"])
+    return bi.astype({"position": "int8", "entry_over": "int8"})
+
+
+def _bowler_overs(balls):
+    """Per (match_id, innings, bowler, over_number): legal balls, runs conceded, wickets, dots, 4s, 6s, extras."""
+    overs = balls.groupby(["match_id", "innings", "bowler", "over_number"], as_index=False, observed=True).agg(
+        balls=("match_id", "size"),
+        legal_balls=("is_legal_ball", "sum"),
+        runs=("bowler_runs_conceded", "sum"),
+        wkts=("is_bowler_wicket", "sum"),
+        dots=("is_dot_ball", "sum"),
+        fours=("is_four", "sum"),
+        sixes=("is_six", "sum"),
+        wide_runs=("wide_ball_runs", "sum"),
+        noball_runs=("no_ball_runs", "sum"),
+    )
+    overs["bowler"] = overs["bowler"].astype(str)
+    overs = overs.sort_values(["match_id", "innings", "bowler", "over_number"], ignore_index=True)
+
+    # spell_no: 1, 2, ... per bowler-innings, a new spell after a gap of more than SPELL_MAX_GAP overs
+    gap = overs.groupby(["match_id", "innings", "bowler"])["over_number"].diff()
+    overs["spell_no"] = (gap.isna() | (gap > SPELL_MAX_GAP)).astype(int).groupby(
+        [overs["match_id"], overs["innings"], overs["bowler"]]
+    ).cumsum()
+
+    for phase, (lo, hi) in FACT_PHASES.items():
+        in_phase = overs["over_number"].between(lo, hi)
+        for col in ["legal_balls", "runs", "wkts"]:
+            overs[f"{phase}_{col}"] = overs[col].where(in_phase, 0)
+    return overs
+
+
+BOWLER_SUM_COLS = ["balls", "legal_balls", "runs", "wkts", "dots", "fours", "sixes", "wide_runs", "noball_runs"]
+BOWLER_PHASE_COLS = [f"{phase}_{col}" for phase in FACT_PHASES for col in ["legal_balls", "runs", "wkts"]]
+
+
+def _bowler_fact(balls, keys, extra_aggs):
+    overs = _bowler_overs(balls)
+    aggs = {"overs": ("over_number", "size"), **extra_aggs}
+    aggs.update({c: (c, "sum") for c in BOWLER_SUM_COLS + BOWLER_PHASE_COLS})
+    out = overs.groupby(keys, as_index=False).agg(**aggs)
+    # per-ball columns are int8 in the compact schema: widen before they are summed further
+    out = out.astype({c: "int64" for c in aggs})
+
+    ctx = _innings_context(balls).drop(columns="team_runs")
+    out = ctx.merge(out, on=["match_id", "innings"])
+    out = _as_plain_keys(out, ["match_date", "venue_region", "team_batting", "team_bowling"])
+    out["economy"] = out["runs"] / (out["legal_balls"] / 6).replace(0, np.nan)
+    lead = ["bowler", "match_id", "innings"] + [k for k in keys if k not in ("match_id", "innings", "bowler")]
+    return out[lead + [c for c in out.columns if c not in lead]]
+
+
+def build_bowler_innings(balls) -> pd.DataFrame:
+    """
+    One row per (match_id, innings, bowler): overs (bowled in, incl. part overs), balls, legal balls (wides excluded),
+    runs conceded (batter + wides + no-balls), wickets (Tab 5 rule), dots / 4s / 6s (legal balls),
+    extras, number of spells and the powerplay / middle / death split.
+    """
+    return _bowler_fact(
+        balls, ["match_id", "innings", "bowler"],
+        {"spells": ("spell_no", "max")},
+    )
+
+
+def build_bowler_spells(balls) -> pd.DataFrame:
+    """
+    One row per (match_id, innings, bowler, spell_no). A spell is a run of the bowler's overs
+    with at most SPELL_MAX_GAP overs between consecutive ones. Same counters as bowler_innings,
+    plus start_over / end_over.
+    """
+    return _bowler_fact(
+        balls, ["match_id", "innings", "bowler", "spell_no"],
+        {"start_over": ("over_number", "min"), "end_over": ("over_number", "max")},
+    )
+
+
+FACT_OUTPUTS = {
+    "batter_innings": {"path": BATTER_INNINGS_PARQUET, "build": build_batter_innings, "sort": ["batter", "match_date", "match_id", "innings"]},
+    "bowler_innings": {"path": BOWLER_INNINGS_PARQUET, "build": build_bowler_innings, "sort": ["bowler", "match_date", "match_id", "innings"]},
+    "bowler_spells": {"path": BOWLER_SPELLS_PARQUET, "build": build_bowler_spells, "sort": ["bowler", "match_date", "match_id", "innings", "spell_no"]},
+}
+
+
+def write_fact_table(name: str, delta: pd.DataFrame, out_dir=DATA_DIR, replace_all=True):
+    """
+    Write a fact table sorted by player (small row groups -> player filters prune the file).
+    replace_all=False merges delta into the stored table, replacing rows of the same matches.
+    """
+    spec = FACT_OUTPUTS[name]
+    path = out_dir / spec["path"].name
+    df = delta
+    if not replace_all and path.exists():
+        stored = pd.read_parquet(path)
+        df = pd.concat([stored[~stored["match_id"].isin(delta["match_id"])], delta], ignore_index=True)
+    df = df.sort_values(spec["sort"], ignore_index=True)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, row_group_size=FACT_ROW_GROUP_SIZE)
+    os.replace(tmp_path, path)
+    return len(df)
+
+
+def build_facts(names, out_dir=DATA_DIR, match_ids=None):
+    """
+    Rebuild fact tables from master2 (all matches, the shared full-history inputs), or fold in only `match_ids`.
+    Returns [(name, rows, seconds)].
+    """
+    t0 = time.perf_counter()
+    balls = (load_inputs() if match_ids is None else read_inputs(ball_match_ids=match_ids, base_match_ids=()))["fact_balls"]
+    results = []
+    for name in names:
+        rows = write_fact_table(name, FACT_OUTPUTS[name]["build"](balls), out_dir, replace_all=match_ids is None)
+        results.append((name, rows, time.perf_counter() - t0))
+        t0 = time.perf_counter()
+    return results
+
+
+def update_facts(names, out_dir=DATA_DIR):
+    """Incremental fact build: only matches missing from each table are read and appended."""
+    all_ids = ball_match_ids()
+    results = []
+    for name in names:
+        path = out_dir / FACT_OUTPUTS[name]["path"].name
+        if not path.exists():
+            results += build_facts([name], out_dir)
+            continue
+        new_ids = all_ids - set(pq.read_table(path, columns=["match_id"])["match_id"].unique().to_pylist())
+        if new_ids:
+            results += build_facts([name], out_dir, match_ids=new_ids)
+    return results
+
+
+# ---------------- Writing ----------------
+def write_csv_atomic(df: pd.DataFrame, path) -> None:
+    """Write to <name>.tmp next to the target, then rename over it (atomic on the same filesystem)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def build_one(name: str, out_dir=DATA_DIR, inputs=None, state=None, folded=frozenset()):
+    """
+    Fold one output's inputs into its state, write the CSV, then the state.
+    Full build: inputs = full history, no prior state. Returns (name, rows, seconds).
+    """
+    t0 = time.perf_counter()
+    spec = KPI_OUTPUTS[name]
+    src = (inputs if inputs is not None else load_inputs())[spec["source"]]
+
+    delta = _as_plain_keys(spec["counters"](src, spec["keys"]), spec["keys"])
+    state = fold_counters(state, delta, spec["keys"], spec["derive"])
+
+    out = spec["publish"](state).reset_index(drop=True)
+    write_csv_atomic(out, out_dir / spec["path"])
+    # state last: if we stop in between, the next run simply folds the same matches again
+    write_state(name, state, set(folded) | set(src["match_id"].unique().tolist()), out_dir)
+    return name, len(out), time.perf_counter() - t0
+
+
+def _executor(jobs: int) -> ProcessPoolExecutor:
+    # fork: workers inherit the already-loaded inputs (master2 is read once)
+    # spawn (Windows): each worker loads the inputs once on start-up
+    if "fork" in mp.get_all_start_methods():
+        return ProcessPoolExecutor(jobs, mp_context=mp.get_context("fork"))
+    return ProcessPoolExecutor(jobs, initializer=load_inputs)
+
+
+def _split_names(only):
+    names = list(only) if only else list(KPI_OUTPUTS) + list(FACT_OUTPUTS)
+    return [n for n in names if n in KPI_OUTPUTS], [n for n in names if n in FACT_OUTPUTS]
+
+
+def build_kpis(only=None, jobs=1, out_dir=DATA_DIR):
+    names, facts = _split_names(only)
+    load_inputs()
+    results = build_facts(facts, out_dir) if facts else []
+    if not names:
+        return results
+
+    if jobs <= 1 or len(names) == 1:
+        return results + [build_one(name, out_dir) for name in names]
+
+    with _executor(min(jobs, len(names))) as pool:
+        return results + list(pool.map(build_one, names, [out_dir] * len(names)))
+
+
+def update_kpis(only=None, out_dir=DATA_DIR):
+    """
+    Incremental build: fold only matches that are not yet in each output's state.
+    Outputs without a stored state are built from full history.
+    """
+    names, facts = _split_names(only)
+    fact_results = update_facts(facts, out_dir) if facts else []
+    if not names:
+        return fact_results
+
+    states = {name: read_state(name, out_dir) for name in names}
+
+    missing = [name for name, (state, _) in states.items() if state is None]
+    if missing:
+        print(f"No stored counters for {', '.join(missing)} -> full build")
+        return fact_results + build_kpis(only=names, out_dir=out_dir)
+
+    all_ids = {
+        "balls": ball_match_ids(),
+        "matches": set(pd.read_csv(MATCH_BASE_CSV, usecols=["match_id"])["match_id"].tolist()),
+    }
+    new_ids = {name: all_ids[KPI_OUTPUTS[name]["source"]] - folded for name, (_, folded) in states.items()}
+
+    def new_for(source):
+        return set().union(*(ids for name, ids in new_ids.items() if KPI_OUTPUTS[name]["source"] == source))
+
+    ball_ids, base_ids = new_for("balls"), new_for("matches")
+    if not ball_ids and not base_ids:
+        return fact_results
+
+    # only the new matches are read from disk
+    delta_inputs = read_inputs(ball_match_ids=ball_ids, base_match_ids=base_ids)
+
+    results = fact_results
+    for name in names:
+        if not new_ids[name]:
+            continue
+        source = KPI_OUTPUTS[name]["source"]
+        src = delta_inputs[source]
+        state, folded = states[name]
+        results.append(
+            build_one(name, out_dir, inputs={source: src[src["match_id"].isin(new_ids[name])]}, state=state, folded=folded)
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the KPI CSVs in data/processed_new from master2.")
+    parser.add_argument(
+        "--only", nargs="+", choices=list(KPI_OUTPUTS) + list(FACT_OUTPUTS), metavar="NAME",
+        help="Build only these outputs (default: all). Names: " + ", ".join(list(KPI_OUTPUTS) + list(FACT_OUTPUTS)),
+    )
+    parser.add_argument("--jobs", type=int, default=1, help="Build independent outputs in N worker processes.")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="Fold only matches not yet counted in data/processed_new/kpi_state/ (runs in one process).",
+    )
+    parser.add_argument("--no-bundle", action="store_true", help="Skip refreshing data/processed_new/kpi_bundle.arrow.")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.incremental:
+        results = update_kpis(only=args.only)
+        if not results:
+            print("✅ No new matches — KPI files are up to date")
+    else:
+        results = build_kpis(only=args.only, jobs=args.jobs)
+
+    for name, rows, secs in results:
+        print(f"✅ {name}: {rows} rows ({secs:.2f}s)")
+
+    if results and not args.no_bundle:
+        from src.build_dataset import export_kpi_bundle
+
+        out_path, n_tables = export_kpi_bundle()
+        print(f"✅ Wrote {n_tables} tables -> {out_path}")
+
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+# src/build_synthetic.py
+"""
+Synthetic scale-up data for load testing (run from the repo root).
+
+    python -m src.build_synthetic --scale 10                     # -> data/synthetic/x10/
+    python -m src.build_synthetic --scale 100 --seed 7 --players 20000 --venues 400
+    python -m src.build_synthetic --scale 1000 --seasons 60 --out /big/disk/x1000
+
+Writes a data tree with the same layout as data/ (master1, master2, the match
+base and the small config CSVs), so every offline build and the app run on it
+unchanged once IPL_DATA_ROOT points there:
+
+    IPL_DATA_ROOT=data/synthetic/x10 python -m src.build_dataset
+    IPL_DATA_ROOT=data/synthetic/x10 python -m src.build_kpis
+    IPL_DATA_ROOT=data/synthetic/x10 python -m src.bench_pages
+
+Every synthetic match is a real match replayed ball by ball (runs, extras,
+wickets, over structure, super overs) under a new match_id, with its players
+remapped onto a synthetic player pool, its ground drawn from a synthetic venue
+pool of the same region, and its season shifted per copy when --seasons spreads
+the data over more years. Ball-level distributions therefore stay those of the
+real data, while player / venue / season cardinalities follow the knobs:
+
+    --scale     matches = scale x real matches (fractions allowed)
+    --players   synthetic player pool (default: real players x scale)
+    --venues    synthetic venue pool (default: real venues x sqrt(scale))
+    --seasons   number of seasons (default: the real ones; more = copies shifted into later years)
+
+Player types (batsman_type / bowler_type) are fixed per synthetic player, so the
+bowler dimension stays one style per bowler. Output is written copy by copy
+(one parquet row group per copy), so memory stays at a few real-data copies
+whatever the scale. Same --seed, same data.
+"""
+
+import argparse
+import json
+import math
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data_loader import BALLS_PARQUET, BASE_DIR, DATA_DIR, DATA_ROOT
+
+SYNTHETIC_ROOT = BASE_DIR / "data" / "synthetic"
+
+MATCHES_CSV = "master1_matches_baseline.csv"
+MATCH_BASE_PATH = Path("KPIs") / "master_kpis" / "matches" / "phase2_match_base_all_venues.csv"
+
+# small lookup / config tables copied as-is (teams stay the real ones)
+COPIED_CSVS = [
+    "master3_teams.csv",
+    "master_team_aliases.csv",
+    "master_teams_ui.csv",
+    "venue_cleanup_map.csv",
+    "gates_config.csv",
+    "optional_toggles_config.csv",
+]
+
+PLAYER_COLUMNS = ["batter", "non_striker", "bowler", "player_out"]
+
+# synthetic overseas grounds carry the name tags the Venue page uses to spot overseas venues
+OVERSEAS_TAGS = ["UAE", "SA"]
+
+FIRST_MATCH_ID = 10_000_000
+
+
+def _read_templates():
+    """Real master2 / master1 / match base, with player columns as codes into one player vocabulary."""
+    balls = pq.read_table(BALLS_PARQUET).to_pandas()
+    matches = pd.read_csv(DATA_DIR / MATCHES_CSV)
+    match_base = pd.read_csv(DATA_ROOT / MATCH_BASE_PATH)
+
+    players = pd.Index(sorted(set().union(*(balls[c].dropna().unique() for c in PLAYER_COLUMNS))))
+    codes = {c: players.get_indexer(balls[c]) for c in PLAYER_COLUMNS}  # -1 = missing
+
+    # fielders_involved is a JSON list of names: keep each distinct value as a list of player codes
+    fielders = pd.Categorical(balls["fielders_involved"])
+    fielder_codes = [
+        [players.get_loc(n) if n in players else None for n in json.loads(v)] if v.startswith("[") else None
+        for v in fielders.categories
+    ]
+
+    matches = matches.sort_values("match_id").reset_index(drop=True)
+    match_pos = pd.Index(matches["match_id"]).get_indexer(balls["match_id"])
+    return {
+        "balls": balls,
+        "schema": pq.read_schema(BALLS_PARQUET),
+        "matches": matches,
+        "match_base": match_base.set_index("match_id"),
+        "match_pos": match_pos,
+        "players": players,
+        "codes": codes,
+        "fielders": fielders,
+        "fielder_codes": fielder_codes,
+    }
+
+
+def _player_pool(t, n_players, rng):
+    """Synthetic names, a fixed shuffle of them, and one batsman_type / bowler_type per player (real mix)."""
+    names = np.array([f"SP{i:07d}" for i in range(n_players)], dtype=object)
+    balls = t["balls"]
+    bat_types = balls.drop_duplicates("batter")["batsman_type"].dropna()
+    bowl_types = balls.drop_duplicates("bowler")["bowler_type"].dropna()
+    return {
+        "names": names,
+        "perm": rng.permutation(n_players),
+        "batsman_type": rng.choice(bat_types.to_numpy(dtype=object), n_players),
+        "bowler_type": rng.choice(bowl_types.to_numpy(dtype=object), n_players),
+    }
+
+
+def _venue_pool(t, n_venues, rng):
+    """Synthetic grounds split India / Overseas in the real proportion of venues, each with a city."""
+    real = t["matches"].drop_duplicates("venue")
+    overseas_share = (real["venue_region"] == "Overseas").mean()
+    n_overseas = max(1, round(n_venues * overseas_share))
+    pool = {}
+    for region, n in [("India", max(1, n_venues - n_overseas)), ("Overseas", n_overseas)]:
+        idx = np.arange(n)
+        if region == "Overseas":
+            tags = np.array(OVERSEAS_TAGS, dtype=object)[idx % len(OVERSEAS_TAGS)]
+            venue = [f"Ground O{i:05d}, {tag}" for i, tag in zip(idx, tags)]
+            city = [f"City O{i // 2:05d}" for i in idx]
+        else:
+            venue = [f"Ground I{i:05d}, City I{i // 2:05d}" for i in idx]
+            city = [f"City I{i // 2:05d}" for i in idx]
+        order = rng.permutation(n)
+        pool[region] = (np.array(venue, dtype=object)[order], np.array(city, dtype=object)[order])
+    return pool
+
+
+def _copy(t, pool, venues, k, template_rows, first_id, seasons, rng):
+    """One replay of the given template matches: (balls table, master1 rows, match base rows)."""
+    matches = t["matches"].iloc[template_rows]
+    n = len(matches)
+
+    # --- match level: new id, season, ground ---
+    new_ids = np.full(len(t["matches"]), -1, dtype=np.int64)
+    new_ids[template_rows] = first_id + np.arange(n)
+
+    real_seasons = np.sort(t["matches"]["season_id"].unique())
+    first_season, n_real = int(real_seasons[0]), len(real_seasons)
+    season_pos = np.searchsorted(real_seasons, matches["season_id"].to_numpy())
+    new_season = first_season + (season_pos + k * n_real) % seasons
+
+    venue_out = np.empty(n, dtype=object)
+    city_out = np.empty(n, dtype=object)
+    regions = matches["venue_region"].to_numpy()
+    for region, (names, cities) in venues.items():
+        mask = regions == region
+        pick = rng.integers(0, len(names), mask.sum())
+        venue_out[mask], city_out[mask] = names[pick], cities[pick]
+
+    dates = np.array(
+        [f"{s}-{d[5:]}" for s, d in zip(new_season, matches["match_date"].astype(str))], dtype=object
+    )
+    master1 = pd.DataFrame({
+        "match_id": new_ids[template_rows],
+        "season_id": new_season,
+        "match_date": dates,
+        "city": city_out,
+        "venue": venue_out,
+        "venue_region": regions,
+    })
+
+    base = t["match_base"].reindex(matches["match_id"]).reset_index()
+    base = base.dropna(subset=["season_id"])
+    keep = matches["match_id"].isin(base["match_id"]).to_numpy()
+    base["match_id"] = master1["match_id"].to_numpy()[keep]
+    base["season_id"] = master1["season_id"].to_numpy()[keep]
+    base["venue"] = master1["venue"].to_numpy()[keep]
+    base["city"] = master1["city"].to_numpy()[keep]
+
+    # --- ball level: replay the template balls ---
+    pos_in_copy = np.full(len(t["matches"]), -1, dtype=np.int64)
+    pos_in_copy[template_rows] = np.arange(n)
+    ball_pos = pos_in_copy[t["match_pos"]]
+    rows = np.flatnonzero(ball_pos >= 0)
+    ball_pos = ball_pos[rows]
+
+    balls = t["balls"].iloc[rows].copy()
+    balls["match_id"] = master1["match_id"].to_numpy()[ball_pos]
+    balls["season_id"] = master1["season_id"].to_numpy()[ball_pos]
+    balls["match_date"] = dates[ball_pos]
+    balls["venue"] = venue_out[ball_pos]
+
+    # players: a per-copy rotation of the synthetic pool keeps distinct real players distinct within a match
+    n_players = len(pool["names"])
+    shift = int(rng.integers(0, n_players))
+
+    def remap(codes):
+        return np.where(codes >= 0, pool["perm"][(codes + shift) % n_players], -1)
+
+    ids = {c: remap(t["codes"][c][rows]) for c in PLAYER_COLUMNS}
+    for c in PLAYER_COLUMNS:
+        col = pool["names"][ids[c]]
+        col[ids[c] < 0] = None
+        balls[c] = col
+    for col, player, types in [("batsman_type", "batter", "batsman_type"), ("bowler_type", "bowler", "bowler_type")]:
+        ok = ids[player] >= 0
+        values = balls[col].to_numpy(dtype=object).copy()
+        values[ok] = pool[types][ids[player][ok]]
+        balls[col] = values
+
+    fielders = []
+    for codes in t["fielder_codes"]:
+        if codes is None:
+            fielders.append(None)
+        else:
+            fielders.append(json.dumps([
+                None if c is None else pool["names"][pool["perm"][(c + shift) % n_players]] for c in codes
+            ]))
+    f_codes = t["fielders"].codes[rows]
+    f_out = np.full(len(rows), None, dtype=object)
+    f_out[f_codes >= 0] = np.array(fielders, dtype=object)[f_codes[f_codes >= 0]]
+    balls["fielders_involved"] = f_out
+
+    table = pa.Table.from_pandas(balls, schema=t["schema"], preserve_index=False)
+    return table, master1, base
+
+
+def build_synthetic(scale, out_root=None, seed=0, players=None, venues=None, seasons=None):
+    """Write a synthetic data tree at `scale` x the real match count. Returns (out_root, matches, balls)."""
+    rng = np.random.default_rng(seed)
+    t = _read_templates()
+    n_real_matches = len(t["matches"])
+    n_matches = max(1, round(scale * n_real_matches))
+    n_seasons = seasons or t["matches"]["season_id"].nunique()
+
+    n_players = players or max(len(t["players"]), round(len(t["players"]) * scale))
+    if n_players < len(t["players"]):
+        raise ValueError(f"--players must be at least the real player count ({len(t['players'])})")
+    n_venues = venues or max(2, round(t["matches"]["venue"].nunique() * math.sqrt(max(scale, 1))))
+
+    pool = _player_pool(t, n_players, rng)
+    venue_pool = _venue_pool(t, n_venues, rng)
+
+    out_root = Path(out_root or SYNTHETIC_ROOT / f"x{scale:g}")
+    out_dir = out_root / "processed_new"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    (out_root / MATCH_BASE_PATH).parent.mkdir(parents=True, exist_ok=True)
+    for name in COPIED_CSVS:
+        shutil.copyfile(DATA_DIR / name, out_dir / name)
+
+    balls_tmp = out_dir / (BALLS_PARQUET.name + ".tmp")
+    matches_tmp = out_dir / (MATCHES_CSV + ".tmp")
+    base_tmp = out_root / MATCH_BASE_PATH.with_suffix(".csv.tmp")
+
+    n_balls = 0
+    done = 0
+    k = 0
+    with pq.ParquetWriter(balls_tmp, t["schema"]) as writer:
+        while done < n_matches:
+            # every full copy replays all real matches; the last one a random subset of them
+            n = min(n_real_matches, n_matches - done)
+            template_rows = np.sort(rng.permutation(n_real_matches)[:n])
+            table, master1, base = _copy(t, pool, venue_pool, k, template_rows, FIRST_MATCH_ID + done, n_seasons, rng)
+            writer.write_table(table)
+            # the first copy overwrites: an interrupted run may have left .tmp rows behind
+            master1.to_csv(matches_tmp, mode="w" if k == 0 else "a", header=k == 0, index=False)
+            base.to_csv(base_tmp, mode="w" if k == 0 else "a", header=k == 0, index=False)
+            n_balls += table.num_rows
+            done += n
+            k += 1
+
+    balls_tmp.replace(out_dir / BALLS_PARQUET.name)
+    matches_tmp.replace(out_dir / MATCHES_CSV)
+    base_tmp.replace(out_root / MATCH_BASE_PATH)
+    return out_root, n_matches, n_balls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic master1/master2 data tree for load testing.")
+    parser.add_argument("--scale", type=float, required=True, help="Matches = scale x the real match count (e.g. 10, 100, 1000).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed + knobs = same data).")
+    parser.add_argument("--players", type=int, help="Synthetic player pool size (default: real players x scale).")
+    parser.add_argument("--venues", type=int, help="Synthetic venue pool size (default: real venues x sqrt(scale)).")
+    parser.add_argument("--seasons", type=int, help="Number of seasons (default: the real ones).")
+    parser.add_argument("--out", help="Output data root (default: data/synthetic/x<scale>).")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    out_root, n_matches, n_balls = build_synthetic(
+        args.scale, out_root=args.out, seed=args.seed, players=args.players, venues=args.venues, seasons=args.seasons
+    )
+    print(f"✅ {n_matches} matches, {n_balls} balls -> {out_root}")
+    print(f"   next: export IPL_DATA_ROOT={out_root}; python -m src.build_dataset && python -m src.build_kpis")
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
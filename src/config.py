@@ -0,0 +1,24 @@
+# src/config.py
+"""
+Locked dataset rules (Home.py -> "Data & Rules").
+
+The derived ball flags (src.data_loader.BALL_FLAG_COLUMNS) are computed from
+these once, when master2 is exported by `python -m src.build_dataset`, and the
+export is stamped with RULES_VERSION. Bump RULES_VERSION whenever a rule below
+(or the set of flag columns) changes: until the dataset is rebuilt, load_balls() notices the stale stamp and
+re-derives the flags at load time instead of serving outdated ones.
+"""
+
+RULES_VERSION = 2
+
+# over_number is 0-based: Powerplay = 0–5, Middle = 6–14, Death = 15–19
+PHASES = {"Powerplay": (0, 5), "Middle": (6, 14), "Death": (15, 19)}
+
+# bowling-style keywords that classify a bowler_type as spin (anything else is pace)
+SPIN_KEYWORDS = ["spin", "legbreak", "offbreak", "orthodox", "chinaman", "googly"]
+
+# spin family of a spin bowler_type: wrist spin if it names one of these, finger spin otherwise
+WRIST_SPIN_KEYWORDS = ["legbreak", "googly", "chinaman", "wrist spin"]
+
+# wicket kinds not credited to the bowler
+NOT_BOWLER_WKTS = {"run out", "retired hurt", "obstructing the field"}
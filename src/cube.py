@@ -0,0 +1,249 @@
+# src/cube.py
+"""
+Pre-aggregated batting / bowling cubes over master2 (super overs excluded).
+
+Each cube holds additive counters per
+
+    venue_region × season_id × player × phase × opponent type
+
+so leaderboards are a slice-and-sum over a few thousand rows instead of
+a groupby over the ball table.
+
+    batting   player = batter,  opponent = bowler_kind  (Spin / Pace, config.SPIN_KEYWORDS rule)
+    bowling   player = bowler,  opponent = batsman_type (Right hand Bat / Left hand Bat)
+
+player / phase / opponent also carry an "All" member (one grouping set per
+combination), so distinct counts such as `matches` stay exact when a
+dimension is rolled up. Region and season need no "All" member: a match
+belongs to exactly one of each, so distinct match counts sum across them.
+
+Built offline by `python -m src.build_dataset` into data/processed_new/cube_<name>.parquet;
+when the file is missing the cube is built from master2 on first use.
+
+Example:
+    import src.cube as cube
+    cube.rollup(
+        "batting",
+        by=["batter"],
+        where={"venue_region": "India", "season_id": None, "phase": "Death"},
+        counters=["runs", "balls", "matches"],
+    )
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import src.perf as perf
+from src.data_loader import DATA_DIR, load_balls
+from src.scope_index import ScopeIndex
+
+ALL = "All"
+
+SCOPE_DIMS = ["venue_region", "season_id"]
+
+# raw columns + the locked-rule flags precomputed in the ball dataset (phase, is_spin_bowler, ...)
+CUBE_BALL_COLUMNS = [
+    "match_id", "season_id", "venue_region",
+    "batter", "bowler", "batsman_type",
+    "batter_runs", "wide_ball_runs", "no_ball_runs",
+    "phase", "is_spin_bowler", "is_legal_ball", "is_batter_out", "is_bowler_wicket",
+    "is_dot_ball", "is_four", "is_six", "bowler_runs_conceded",
+]
+
+
+# ---------------- Per-ball measures ----------------
+def _batting_measures(balls):
+    return pd.DataFrame({
+        "venue_region": balls["venue_region"].astype(str),
+        "season_id": balls["season_id"].astype(int),
+        "batter": balls["batter"].astype(str),
+        "phase": balls["phase"].astype(object),
+        "bowler_kind": np.where(balls["is_spin_bowler"], "Spin", "Pace"),
+        "match_id": balls["match_id"],
+        "runs": balls["batter_runs"].astype(int),
+        "balls": balls["is_legal_ball"].astype(int),
+        "outs": balls["is_batter_out"].astype(int),
+        "dots": balls["is_dot_ball"].astype(int),
+        "fours": balls["is_four"].astype(int),
+        "sixes": balls["is_six"].astype(int),
+    })
+
+
+def _bowling_measures(balls):
+    legal = balls["is_legal_ball"]
+    runs = balls["bowler_runs_conceded"]
+    wkts = balls["is_bowler_wicket"]
+
+    return pd.DataFrame({
+        "venue_region": balls["venue_region"].astype(str),
+        "season_id": balls["season_id"].astype(int),
+        "bowler": balls["bowler"].astype(str),
+        "phase": balls["phase"].astype(object),
+        "batsman_type": balls["batsman_type"].astype(str),
+        "match_id": balls["match_id"],
+        # legal-ball match ids (NaN on wides) -> legal_matches
+        "legal_match_id": balls["match_id"].where(legal),
+        "balls": 1,
+        "legal_balls": legal.astype(int),
+        "runs": runs.astype(int),
+        "legal_runs": runs.where(legal, 0).astype(int),
+        "wkts": wkts.astype(int),
+        "legal_wkts": (wkts & legal).astype(int),
+        "dots": balls["is_dot_ball"].astype(int),
+        "fours": balls["is_four"].astype(int),
+        "sixes": balls["is_six"].astype(int),
+        "wide_runs": balls["wide_ball_runs"].astype(int),
+        "noball_runs": balls["no_ball_runs"].astype(int),
+    })
+
+
+# ---------------- Cube definitions ----------------
+# rollup_dims: dimensions with an "All" member
+# sums:        counter -> per-ball column summed
+# distinct:    counter -> per-ball column counted with nunique (NaN ignored)
+CUBES = {
+    "batting": {
+        "path": DATA_DIR / "cube_batting.parquet",
+        "measures": _batting_measures,
+        "rollup_dims": ["batter", "phase", "bowler_kind"],
+        "sums": ["runs", "balls", "outs", "dots", "fours", "sixes"],
+        "distinct": {"matches": "match_id"},
+    },
+    "bowling": {
+        "path": DATA_DIR / "cube_bowling.parquet",
+        "measures": _bowling_measures,
+        "rollup_dims": ["bowler", "phase", "batsman_type"],
+        "sums": [
+            "balls", "legal_balls", "runs", "legal_runs", "wkts", "legal_wkts",
+            "dots", "fours", "sixes", "wide_runs", "noball_runs",
+        ],
+        "distinct": {"matches": "match_id", "legal_matches": "legal_match_id"},
+    },
+}
+
+
+def _grouping_sets(rollup_dims):
+    for k in range(len(rollup_dims), -1, -1):
+        yield from combinations(rollup_dims, k)
+
+
+def build_cube(name: str, balls: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Aggregate master2 (super overs removed) into the cube `name`.
+    Rolled-up dimensions hold ALL; every grouping set is stacked into one frame.
+    """
+    spec = CUBES[name]
+    if balls is None:
+        balls = load_balls(columns=CUBE_BALL_COLUMNS, filters={"is_super_over": False})
+    m = spec["measures"](balls)
+
+    dims = SCOPE_DIMS + spec["rollup_dims"]
+    aggs = {c: (c, "sum") for c in spec["sums"]}
+    aggs.update({c: (col, "nunique") for c, col in spec["distinct"].items()})
+
+    parts = []
+    for kept in _grouping_sets(spec["rollup_dims"]):
+        g = m.groupby(SCOPE_DIMS + list(kept), as_index=False).agg(**aggs)
+        for d in spec["rollup_dims"]:
+            if d not in kept:
+                g[d] = ALL
+        parts.append(g[dims + list(aggs)])
+
+    cube = pd.concat(parts, ignore_index=True)
+    for c in aggs:
+        cube[c] = cube[c].astype("int64")
+    return cube
+
+
+def export_cube(name: str, balls: pd.DataFrame = None, out_path=None):
+    out_path = out_path or CUBES[name]["path"]
+    cube = build_cube(name, balls)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    cube.to_parquet(tmp_path, index=False)
+    tmp_path.replace(out_path)
+    return out_path, len(cube)
+
+
+# ---------------- Loading ----------------
+@st.cache_resource(show_spinner=False, max_entries=len(CUBES))
+def _cube_parts(name: str, mtime_ns):
+    """
+    Cube split by grouping set: {kept dims (tuple): frame holding only those dims + counters},
+    each sorted by region / season (so a scope is one contiguous slice, see _cube_index).
+    Keyed on the file mtime so a rebuilt cube is picked up without a restart.
+    """
+    spec = CUBES[name]
+    cube = pd.read_parquet(spec["path"]) if mtime_ns is not None else build_cube(name)
+
+    parts = {}
+    all_mask = pd.DataFrame({d: cube[d] == ALL for d in spec["rollup_dims"]})
+    for kept in _grouping_sets(spec["rollup_dims"]):
+        rolled = [d for d in spec["rollup_dims"] if d not in kept]
+        mask = all_mask[rolled].all(axis=1) & ~all_mask[list(kept)].any(axis=1)
+        part = cube.loc[mask].drop(columns=rolled)
+        parts[kept] = part.sort_values(SCOPE_DIMS, kind="stable", ignore_index=True)
+    return parts
+
+
+@st.cache_resource(show_spinner=False, max_entries=len(CUBES))
+def _cube_index(name: str, mtime_ns):
+    """{kept dims: ScopeIndex over that part's region / season blocks} (see src.scope_index)."""
+    indexes = {}
+    for kept, part in _cube_parts(name, mtime_ns).items():
+        blocks = part.groupby(SCOPE_DIMS, sort=False).ngroup().to_numpy()
+        indexes[kept] = ScopeIndex(blocks, {d: [part[d].to_numpy()] for d in SCOPE_DIMS}, sort_by=SCOPE_DIMS)
+    return indexes
+
+
+def _mtime_ns(name: str):
+    path = CUBES[name]["path"]
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+def load_cube(name: str) -> dict:
+    return _cube_parts(name, _mtime_ns(name))
+
+
+def counter_names(name: str) -> list:
+    spec = CUBES[name]
+    return spec["sums"] + list(spec["distinct"])
+
+
+@perf.timed()
+def rollup(name: str, by=(), where=None, counters=None) -> pd.DataFrame:
+    """
+    Sum the cube over every dimension not in `by`, sorted by `by`.
+
+    where: {"dim": value} slice; None values are skipped (= All),
+    lists/tuples/sets become isin() (same convention as load_balls filters).
+    Region / season resolve through the part's ScopeIndex (a slice, no scan);
+    the other dimensions are matched on the selected rows only.
+
+    Distinct counters (matches) are exact for any rollup over "All" members and
+    over region/season; filtering a player/phase/opponent dimension to several
+    members without grouping by it over-counts them.
+    """
+    spec = CUBES[name]
+    by = list(by)
+    where = {k: v for k, v in (where or {}).items() if v is not None}
+    cols = list(counters) if counters is not None else counter_names(name)
+
+    kept = tuple(d for d in spec["rollup_dims"] if d in by or d in where)
+    df = load_cube(name)[kept]
+
+    scope = {d: where.pop(d) for d in SCOPE_DIMS if d in where}
+    if scope:
+        df = _cube_index(name, _mtime_ns(name))[kept].take(df, scope)
+
+    for col, value in where.items():
+        if isinstance(value, (list, tuple, set, frozenset)):
+            df = df[df[col].isin(list(value))]
+        else:
+            df = df[df[col] == value]
+
+    if not by:
+        return df[cols].sum().to_frame().T.astype("int64")
+    return df.groupby(by, as_index=False, sort=True)[cols].sum()
@@ -0,0 +1,1150 @@
+# src/dashboard_utils.py
+"""
+Section computations for the dashboard pages, memoized per section.
+
+Streamlit reruns the whole page script on every widget change. Each page
+section's numbers come from one function here, keyed on the page scope
+(region, season) plus that section's own options, so a rerun only
+recomputes the sections whose inputs changed; the others are served from
+st.cache_data. Pages keep the widgets, charts and copy.
+
+Conventions:
+    region   venue_region ("India" / "Overseas") or None for all regions
+    season   season_id (int) or None for all seasons
+    bucket   clean matches-played bucket: "All", "1–25", "26–50", "51–75", "75+"
+             (MATCH_BUCKETS maps the selectbox labels to these)
+
+Results are returned as copies (st.cache_data), so pages may modify them.
+
+Example:
+    import src.dashboard_utils as du
+    top = du.batting_leaderboard("India", 2024, metric="SR", bucket="75+", top_n=5)
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import src.cube as cube
+import src.data_loader as dl
+import src.database_manager as db
+import src.perf as perf
+
+# one entry per (scope, section options); a few hundred small frames at most
+SECTION_CACHE_ENTRIES = 256
+
+
+def memoized(func):
+    """Memoize a section computation on its arguments (returns a copy per call); timed hit or miss."""
+    return perf.timed(func.__name__)(st.cache_data(show_spinner=False, max_entries=SECTION_CACHE_ENTRIES)(func))
+
+
+# -----------------------------
+# Shared scope helpers
+# -----------------------------
+# "🎯 Matches played" selectbox label -> clean experience bucket
+MATCH_BUCKETS = {
+    "All (all experience levels)": "All",
+    "1–25 (small sample)": "1–25",
+    "26–50 (emerging core)": "26–50",
+    "51–75 (proven regulars)": "51–75",
+    "75+ (elite longevity)": "75+",
+}
+
+PHASE_ORDER = ["Powerplay", "Middle", "Death"]
+
+
+def scope_filters(region=None, season=None) -> dict:
+    """(region, season) -> the filters / cube `where` dict used by every loader."""
+    return {
+        "venue_region": region,
+        "season_id": int(season) if season is not None else None,
+    }
+
+
+def _match_bucket(matches: pd.Series) -> pd.Series:
+    """Experience bucket (by matches) as a categorical (Batting sections)."""
+    return pd.cut(
+        matches,
+        bins=[0, 25, 50, 75, 10_000],
+        labels=["1–25", "26–50", "51–75", "75+"],
+        include_lowest=True
+    )
+
+
+def _exp_bucket(m):
+    """Experience bucket (by matches) as a label (Bowling sections)."""
+    if m <= 25:
+        return "1–25"
+    if m <= 50:
+        return "26–50"
+    if m <= 75:
+        return "51–75"
+    return "75+"
+
+
+def _ranked(df: pd.DataFrame, by, ascending, top_n: int) -> pd.DataFrame:
+    """Top-N rows by `by`, with a 1-based `rank` column (chart colour + y-order)."""
+    out = df.sort_values(by, ascending=ascending).head(top_n).copy()
+    out["rank"] = range(1, len(out) + 1)
+    return out
+
+
+# =========================================================
+# Tab 1: All Seasons — Quick Insights (over fact table)
+# =========================================================
+@memoized
+def quick_summary(region=None, season=None) -> dict:
+    """Quick Summary tiles: match volume, run rate, extras, wickets and innings extremes."""
+    scope = scope_filters(region, season)
+    overs = dl.load_master_overs(filters=scope)
+
+    total_matches = int(overs["match_id"].nunique())
+    total_balls = int(overs["balls"].sum())
+    total_runs = int(overs["runs"].sum())
+    extras_runs = int(overs["extras"].sum())
+    wkts = int(overs["wickets"].sum())
+
+    # valid innings filter (avoid tiny partial innings)
+    innings = dl.load_master_innings(filters=scope)
+    valid = innings[innings["balls"] >= 48]
+
+    return {
+        "total_matches": total_matches,
+        "run_rate": (total_runs / total_balls * 6) if total_balls > 0 else 0.0,
+        "extras_pct": (extras_runs / total_runs * 100) if total_runs > 0 else 0.0,
+        "wkts_per_match": (wkts / total_matches) if total_matches > 0 else 0.0,
+        "highest_score": int(valid["total_runs"].max()) if len(valid) else 0,
+        "lowest_score": int(valid["total_runs"].min()) if len(valid) else 0,
+    }
+
+
+@memoized
+def phase_run_split(region=None, season=None) -> pd.DataFrame:
+    """Runs + run share % per phase (Powerplay / Middle / Death order)."""
+    overs = dl.load_master_overs(filters=scope_filters(region, season))
+
+    # phase is precomputed on the over table (overs 0–5 / 6–14 / 15–19)
+    phase_agg = (
+        overs.groupby("phase", as_index=False, observed=True)
+        .agg(total_runs=("runs", "sum"), balls=("balls", "sum"))
+    )
+    phase_agg["phase"] = pd.Categorical(phase_agg["phase"], categories=PHASE_ORDER, ordered=True)
+    phase_agg = phase_agg.sort_values("phase").copy()
+
+    total_phase_runs = float(phase_agg["total_runs"].sum())
+    phase_agg["run_share_pct"] = (phase_agg["total_runs"] / total_phase_runs * 100).fillna(0).round(2)
+    return phase_agg
+
+
+@memoized
+def league_environment_trend(region=None) -> pd.DataFrame:
+    """Boundary %, dot ball % and wickets per match per season, long format (all seasons)."""
+    overs = dl.load_master_overs(filters=scope_filters(region, None))
+
+    season_kpis = (
+        overs.assign(boundaries=overs["fours"] + overs["sixes"])
+        .groupby("season_id", as_index=False)
+        .agg(
+            matches=("match_id", "nunique"),
+            balls=("balls", "sum"),
+            boundaries=("boundaries", "sum"),
+            dots=("dots", "sum"),
+            wickets=("wickets", "sum"),
+        )
+        .sort_values("season_id")
+    )
+
+    season_kpis["boundary_pct"] = (season_kpis["boundaries"] / season_kpis["balls"] * 100).fillna(0)
+    season_kpis["dot_ball_pct"] = (season_kpis["dots"] / season_kpis["balls"] * 100).fillna(0)
+    season_kpis["wkts_per_match"] = (season_kpis["wickets"] / season_kpis["matches"]).fillna(0)
+
+    return pd.DataFrame(
+        {
+            "season_id": list(season_kpis["season_id"]) * 3,
+            "metric": (["Boundary %"] * len(season_kpis))
+            + (["Dot ball %"] * len(season_kpis))
+            + (["Wickets per match"] * len(season_kpis)),
+            "value": list(season_kpis["boundary_pct"])
+            + list(season_kpis["dot_ball_pct"])
+            + list(season_kpis["wkts_per_match"]),
+        }
+    )
+
+
+# =========================================================
+# Tab 2: Match & Toss Strategy (match-level toss base)
+# =========================================================
+@memoized
+def toss_base() -> pd.DataFrame:
+    """Match toss base with team ids mapped to names and normalized decision / result."""
+    df = dl.load_match_toss_base()
+    teams = dl.load_csv("master3_teams.csv")
+
+    team_map = dict(zip(teams["team_id"], teams["team_name"]))
+
+    # map ids -> names for readability
+    for col in ["team_batting", "team_bowling", "match_winner", "toss_winner"]:
+        df[col] = df[col].map(team_map).fillna(df[col].astype(str))
+
+    df["toss_decision"] = df["toss_decision"].astype(str).str.lower().str.strip()
+    df["result"] = df["result"].astype(str).str.lower().str.strip()
+    return df
+
+
+@memoized
+def toss_kpis(region=None, season=None) -> dict:
+    """Core toss + result quality KPIs for the scope."""
+    f = toss_base()
+    if region is not None:
+        f = f[f["venue_region"] == region]
+    if season is not None:
+        f = f[f["season_id"] == season]
+
+    f_valid = f.dropna(subset=["toss_winner", "match_winner"])
+
+    decision_counts = f["toss_decision"].value_counts(dropna=True)
+    chase_matches = f_valid[f_valid["toss_decision"] == "field"]
+    defend_matches = f_valid[f_valid["toss_decision"] == "bat"]
+
+    # Super over count: compute from master2 (match_id-level only)
+    super_over_balls = dl.load_balls(columns=["match_id"], filters={"is_super_over": True})
+    super_over_match_ids = super_over_balls.loc[super_over_balls["match_id"].isin(f["match_id"].unique()), "match_id"].unique()
+
+    return {
+        "toss_win_rate": (f_valid["toss_winner"] == f_valid["match_winner"]).mean() if len(f_valid) else 0.0,
+        "field_pct": decision_counts.get("field", 0) / decision_counts.sum() if decision_counts.sum() else 0.0,
+        "bat_pct": decision_counts.get("bat", 0) / decision_counts.sum() if decision_counts.sum() else 0.0,
+        "chase_win_pct": (chase_matches["toss_winner"] == chase_matches["match_winner"]).mean() if len(chase_matches) else 0.0,
+        "defend_win_pct": (defend_matches["toss_winner"] == defend_matches["match_winner"]).mean() if len(defend_matches) else 0.0,
+        "match_count": f["match_id"].nunique(),
+        "no_result_count": (f["result"] == "no result").sum(),
+        "tie_count": (f["result"] == "tie").sum(),
+        "super_over_count": len(super_over_match_ids),
+        "avg_win_runs": f["win_by_runs"].dropna().mean() if "win_by_runs" in f else 0.0,
+        "avg_win_wkts": f["win_by_wickets"].dropna().mean() if "win_by_wickets" in f else 0.0,
+    }
+
+
+@memoized
+def season_toss_kpis(season_id: int) -> dict:
+    """Toss preference, chase / defend success and win margins for one season (all venues)."""
+    base_df = toss_base()
+    s = base_df[base_df["season_id"] == season_id].copy()
+    s_valid = s.dropna(subset=["toss_winner", "match_winner"])
+
+    # Decision preference
+    dec_counts = s["toss_decision"].value_counts(dropna=True)
+    field_pct_s = dec_counts.get("field", 0) / dec_counts.sum() if dec_counts.sum() else 0.0
+    bat_pct_s = dec_counts.get("bat", 0) / dec_counts.sum() if dec_counts.sum() else 0.0
+
+    # Chase vs Defend success (toss winner)
+    chase_s = s_valid[s_valid["toss_decision"] == "field"]
+    defend_s = s_valid[s_valid["toss_decision"] == "bat"]
+    chase_win_s = (chase_s["toss_winner"] == chase_s["match_winner"]).mean() if len(chase_s) else 0.0
+    defend_win_s = (defend_s["toss_winner"] == defend_s["match_winner"]).mean() if len(defend_s) else 0.0
+
+    # Margins
+    avg_runs_s = s["win_by_runs"].dropna().mean()
+    avg_wkts_s = s["win_by_wickets"].dropna().mean()
+
+    return {
+        "Season": season_id,
+        "Field %": round(field_pct_s * 100, 1),
+        "Bat %": round(bat_pct_s * 100, 1),
+        "Chase Win % (Toss Winner)": round(chase_win_s * 100, 1),
+        "Defend Win % (Toss Winner)": round(defend_win_s * 100, 1),
+        "Avg Win Runs": round(avg_runs_s, 1) if pd.notna(avg_runs_s) else None,
+        "Avg Win Wkts": round(avg_wkts_s, 1) if pd.notna(avg_wkts_s) else None,
+    }
+
+
+# =========================================================
+# Tab 3: Venue Intelligence (precomputed venue KPI files)
+# =========================================================
+@memoized
+def venue_matches(region=None, season=None) -> pd.DataFrame:
+    """Matches in scope, venue names cleaned with venue_cleanup_map.csv."""
+    matches = dl.load_master_matches()
+    vmap = dl.load_csv("venue_cleanup_map.csv")  # from data/processed_new/
+    venue_map = dict(zip(vmap["venue_raw"], vmap["venue_clean"]))
+
+    matches["venue"] = matches["venue"].astype(str).str.strip()
+    matches["venue_region"] = matches["venue_region"].astype(str).str.strip()
+    matches["venue"] = matches["venue"].map(venue_map).fillna(matches["venue"])
+
+    if region is not None:
+        matches = matches[matches["venue_region"] == region]
+    if season is not None:
+        matches = matches[matches["season_id"] == season]
+    return matches
+
+
+def _venue_kpi(name: str, region=None, season=None) -> pd.DataFrame:
+    """A tab3_venue_kpis table restricted to the venues in scope."""
+    df = dl.load_csv("tab3_venue_kpis", name)
+    return df[df["venue"].isin(venue_matches(region, season)["venue"].unique())].copy()
+
+
+@memoized
+def venue_summary(region=None, season=None) -> dict:
+    """Venue KPI cards: match / ground counts and innings scoring (innings fact table)."""
+    matches = venue_matches(region, season)
+    innings = dl.load_master_innings(filters=scope_filters(region, season))
+
+    return {
+        "total_matches": matches["match_id"].nunique(),
+        "unique_grounds": matches["venue"].nunique(),
+        "avg_match_runs": innings.groupby("match_id")["total_runs"].sum().mean(),
+        "overall_rpo": (innings["total_runs"].sum() / innings["balls"].sum()) * 6,
+        "highest_innings": innings["total_runs"].max(),
+        "lowest_innings_60": innings.loc[innings["over_balls"] >= 60, "over_ball_runs"].min(),
+    }
+
+
+def _is_overseas_venue(v: str) -> bool:
+    v = str(v)
+    return any(tag in v for tag in [", UAE", ", SA", "Abu Dhabi", "Dubai", "Sharjah"])
+
+
+@memoized
+def most_used_venues(region=None, season=None, overseas=False, top_n=5) -> pd.DataFrame:
+    """Top-N venues by matches, India or overseas grounds only."""
+    most_used = _venue_kpi("venue_most_used.csv", region, season)
+    most_used["is_overseas"] = most_used["venue"].apply(_is_overseas_venue)
+    most_used = most_used[most_used["is_overseas"] == overseas]
+
+    return _ranked(most_used, "matches", False, top_n)
+
+
+@memoized
+def chase_defend_bias(region=None, season=None, min_matches=20) -> pd.DataFrame:
+    """Ten venues with the strongest chase (+) / defend (-) bias."""
+    bias = _venue_kpi("venue_chase_defend_bias.csv", region, season)
+    bias = bias[bias["matches"] >= min_matches].copy()
+    bias["abs_bias"] = bias["bias"].abs()
+    bias = bias.sort_values("abs_bias", ascending=False).head(10).copy()
+    bias["recommendation"] = bias["bias"].apply(lambda x: "Chase" if x >= 0 else "Defend")
+    return bias
+
+
+@memoized
+def toss_influence(region=None, season=None, min_matches=20) -> pd.DataFrame:
+    """Ten venues where the toss winner most often also wins the match."""
+    toss = _venue_kpi("venue_toss_influence.csv", region, season)
+    toss = toss[toss["matches"] >= max(10, min_matches)].copy()
+    toss["toss_impact_pct"] = toss["toss_win_match_rate"] * 100
+    toss["impact_level"] = toss["toss_impact_pct"].apply(lambda x: "High impact" if x >= 55 else "Moderate")
+    return toss.sort_values("toss_impact_pct", ascending=False).head(10).copy()
+
+
+@memoized
+def toss_decision_preference(region=None, season=None, min_matches=20) -> tuple:
+    """(plot frame, y order): five strongest field-first and five strongest bat-first venues."""
+    pref_all = _venue_kpi("venue_toss_influence.csv", region, season)
+    pref_all = pref_all[pref_all["matches"] >= max(10, min_matches)].copy()
+
+    top_pos = pref_all.sort_values("decision_preference_index", ascending=False).head(5).copy()
+    top_neg = pref_all.sort_values("decision_preference_index", ascending=True).head(5).copy()
+    pref_plot = pd.concat([top_pos, top_neg], ignore_index=True)
+
+    top_pos_order = top_pos.sort_values("decision_preference_index", ascending=False)["venue"].tolist()
+    top_neg_order = top_neg.sort_values("decision_preference_index", ascending=True)["venue"].tolist()
+
+    pref_plot["pref_label"] = pref_plot["decision_preference_index"].apply(
+        lambda x: "Prefer Field First" if x >= 0 else "Prefer Bat First"
+    )
+    return pref_plot, top_pos_order + top_neg_order
+
+
+# =========================================================
+# Tab 4: Batting Analysis
+# =========================================================
+BATTING_BALL_COLUMNS = [
+    "match_id", "season_id", "innings",
+    "batter", "batter_runs", "wicket_kind",
+    # locked-rule flags, precomputed in the ball dataset (src/config.py)
+    "is_legal_ball", "is_batter_out", "is_dot_ball", "is_four", "is_six",
+]
+
+# Rank-by option -> (column, axis label, label format[, ascending])
+BATTING_LEADERBOARD_METRICS = {
+    "Runs": ("runs", "Runs", ".0f"),
+    "SR": ("strike_rate", "Strike Rate", ".1f"),
+    "Avg": ("average", "Average", ".1f"),
+    "Matches": ("matches", "Matches", ".0f"),
+}
+
+BATTING_PRESSURE_METRICS = {
+    "Dot Ball % ↓": ("dot_ball_pct", "Dot Ball % (Lower is better)", ".1f", True),
+    "4s": ("fours", "4s", ".0f", False),
+    "6s": ("sixes", "6s", ".0f", False),
+    "Boundary %": ("boundary_pct", "Boundary %", ".1f", False),
+}
+
+BATTING_PHASE_METRICS = {
+    "SR": ("strike_rate", "Strike Rate", ".1f"),
+    "Runs": ("runs", "Runs", ".0f"),
+    "Boundary %": ("boundary_pct", "Boundary %", ".1f"),
+}
+
+BATTING_MATCHUP_METRICS = {
+    "SR": ("strike_rate", "Strike Rate", ".1f", False),
+    "Runs": ("runs", "Runs", ".0f", False),
+    "Dot Ball % ↓": ("dot_ball_pct", "Dot Ball % (Lower is better)", ".1f", True),
+}
+
+# dismissal option -> wicket_kind values
+DISMISSAL_KINDS = {
+    "Caught": ["caught"],
+    "Bowled": ["bowled"],
+    "LBW": ["lbw"],
+    "Run Out": ["run out"],
+    "Stumped": ["stumped"],
+}
+
+
+def _batting_balls(region=None, season=None) -> pd.DataFrame:
+    # Region + Season resolve to parquet partitions; super overs are removed in the scan.
+    return dl.load_balls(
+        columns=BATTING_BALL_COLUMNS,
+        filters={"is_super_over": False, **scope_filters(region, season)},
+    )
+
+
+@memoized
+def batting_summary(region=None, season=None) -> dict:
+    """Batting Summary KPIs: total runs, overall SR / average / dot ball %."""
+    balls = _batting_balls(region, season)
+
+    # --- Locked rules: is_legal_ball / is_batter_out / is_dot_ball come precomputed ---
+    total_runs = int(balls["batter_runs"].sum())
+    total_balls = int(balls["is_legal_ball"].sum())
+    total_outs = int(balls["is_batter_out"].sum())
+
+    return {
+        "total_runs": total_runs,
+        "total_balls": total_balls,
+        "total_outs": total_outs,
+        "unique_batters": int(balls["batter"].nunique()),
+        "overall_sr": (total_runs / total_balls) * 100 if total_balls > 0 else 0,
+        "overall_dot_pct": (balls["is_dot_ball"].sum() / total_balls) * 100 if total_balls > 0 else 0,
+        "overall_avg": (total_runs / total_outs) if total_outs > 0 else 0,
+    }
+
+
+@memoized
+def batting_leaderboard(region=None, season=None, metric="Runs", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by Runs / SR / Avg / Matches, with the metric-specific stability gates."""
+    # Leaderboard aggregate runs in DuckDB (same scope; legal balls / outs are the stored ball flags)
+    player_alltime = db.query(
+        f"""
+        SELECT
+            batter,
+            SUM(batter_runs)::BIGINT AS runs,
+            SUM(is_legal_ball::INTEGER)::BIGINT AS balls,
+            SUM(is_batter_out::INTEGER)::BIGINT AS outs,
+            COUNT(DISTINCT match_id)::BIGINT AS matches
+        FROM balls
+        WHERE {db.SCOPE_WHERE}
+        GROUP BY batter
+        ORDER BY batter
+        """,
+        db.scope_params(region, season),
+    )
+
+    player_alltime["strike_rate"] = np.where(
+        player_alltime["balls"] > 0,
+        (player_alltime["runs"] / player_alltime["balls"]) * 100,
+        np.nan
+    )
+    player_alltime["average"] = np.where(
+        player_alltime["outs"] > 0,
+        (player_alltime["runs"] / player_alltime["outs"]),
+        np.nan
+    )
+    player_alltime["match_bucket"] = _match_bucket(player_alltime["matches"])
+
+    qual_df = player_alltime
+    if bucket != "All":
+        qual_df = qual_df[qual_df["match_bucket"] == bucket]
+
+    # metric-specific gates (LOCKED)
+    if metric in ["Runs", "Matches"]:
+        qual_df = qual_df[qual_df["balls"] >= 200]
+    elif metric == "SR":
+        qual_df = qual_df[qual_df["balls"] >= 400]
+    elif metric == "Avg":
+        qual_df = qual_df[(qual_df["balls"] >= 300) & (qual_df["outs"] >= 15)]
+
+    return _ranked(qual_df, BATTING_LEADERBOARD_METRICS[metric][0], False, top_n)
+
+
+@memoized
+def batting_pressure(region=None, season=None, metric="Dot Ball % ↓", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by dot ball % / 4s / 6s / boundary % (min 200 balls)."""
+    # --- Batter totals from the cube (locked rules: legal-ball dots / fours / sixes) ---
+    pb = cube.rollup(
+        "batting", by=["batter"], where=scope_filters(region, season),
+        counters=["runs", "balls", "dots", "fours", "sixes", "matches"],
+    ).rename(columns={"dots": "dot_balls"})
+    pb["boundary_runs"] = pb["fours"] * 4 + pb["sixes"] * 6
+
+    pb["dot_ball_pct"] = np.where(pb["balls"] > 0, (pb["dot_balls"] / pb["balls"]) * 100, np.nan)
+    pb["boundary_pct"] = np.where(pb["runs"] > 0, (pb["boundary_runs"] / pb["runs"]) * 100, np.nan)
+
+    # ✅ Base stability gate (LOCKED)
+    pb = pb[pb["balls"] >= 200].copy()
+    pb["match_bucket"] = _match_bucket(pb["matches"])
+    if bucket != "All":
+        pb = pb[pb["match_bucket"] == bucket]
+
+    metric_col, _, _, invert = BATTING_PRESSURE_METRICS[metric]
+    # sorting direction (invert=True => ascending for Dot%)
+    return _ranked(pb, metric_col, invert, top_n)
+
+
+@memoized
+def batting_phase(region=None, season=None, phase="Powerplay", metric="SR", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters in one phase by SR / runs / boundary % (min 120 phase balls)."""
+    # --- In-phase batter totals from the cube (over_number is 0-based) ---
+    ph = cube.rollup(
+        "batting", by=["batter"], where={**scope_filters(region, season), "phase": phase},
+        counters=["runs", "balls", "fours", "sixes", "matches"],
+    )
+    ph["boundary_runs"] = ph["fours"] * 4 + ph["sixes"] * 6
+
+    ph["strike_rate"] = np.where(ph["balls"] > 0, (ph["runs"] / ph["balls"]) * 100, np.nan)
+    ph["boundary_pct"] = np.where(ph["runs"] > 0, (ph["boundary_runs"] / ph["runs"]) * 100, np.nan)
+
+    # ✅ base phase stability gate (LOCKED)
+    ph = ph[ph["balls"] >= 120].copy()
+    ph["match_bucket"] = _match_bucket(ph["matches"])
+    if bucket != "All":
+        ph = ph[ph["match_bucket"] == bucket]
+
+    return _ranked(ph, BATTING_PHASE_METRICS[metric][0], False, top_n)
+
+
+@memoized
+def batting_rotation(region=None, season=None, bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by non-boundary strike rate (min 200 balls)."""
+    nb = cube.rollup(
+        "batting", by=["batter"], where=scope_filters(region, season),
+        counters=["matches", "runs", "balls", "fours", "sixes"],
+    )
+    nb["boundary_runs"] = nb["fours"] * 4 + nb["sixes"] * 6
+
+    # a legal ball is a "boundary ball" if it resulted in 4 or 6 off the bat
+    nb["boundary_balls"] = nb["fours"] + nb["sixes"]
+    nb = nb.drop(columns=["fours", "sixes"])
+
+    nb["non_boundary_runs"] = nb["runs"] - nb["boundary_runs"]
+    nb["non_boundary_balls"] = nb["balls"] - nb["boundary_balls"]
+
+    nb["non_boundary_sr"] = np.where(
+        nb["non_boundary_balls"] > 0,
+        (nb["non_boundary_runs"] / nb["non_boundary_balls"]) * 100,
+        np.nan
+    )
+
+    # ✅ base stability gate (LOCKED)
+    nb = nb[nb["balls"] >= 200].copy()
+    nb["match_bucket"] = _match_bucket(nb["matches"])
+    if bucket != "All":
+        nb = nb[nb["match_bucket"] == bucket]
+
+    return _ranked(nb, "non_boundary_sr", False, top_n)
+
+
+@memoized
+def batting_bat_time(region=None, season=None, bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by average legal balls faced per innings (min 200 balls)."""
+    # --- Batter-innings grain (match_id + innings + batter), precomputed by the KPI pipeline ---
+    bi = dl.load_batter_innings(filters={"is_super_over": False, **scope_filters(region, season)})
+
+    # remove empty rows (shouldn't happen, but safe)
+    bi = bi[bi["balls_faced"] > 0]
+
+    bpi = (
+        bi.groupby("batter", as_index=False, observed=True)
+        .agg(
+            innings=("match_id", "count"),  # number of batter-innings appearances
+            total_balls=("balls_faced", "sum"),
+            total_runs=("runs", "sum"),
+            matches=("match_id", "nunique"),
+        )
+    )
+
+    bpi["avg_balls_per_innings"] = np.where(
+        bpi["innings"] > 0,
+        bpi["total_balls"] / bpi["innings"],
+        np.nan
+    )
+
+    # ✅ base stability gate (LOCKED)
+    bpi = bpi[bpi["total_balls"] >= 200].copy()
+    bpi["match_bucket"] = _match_bucket(bpi["matches"])
+    if bucket != "All":
+        bpi = bpi[bpi["match_bucket"] == bucket]
+
+    return _ranked(bpi, "avg_balls_per_innings", False, top_n)
+
+
+@memoized
+def batting_phase_boundaries(region=None, season=None, phase="Powerplay", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by boundary % in one phase (min 120 phase balls)."""
+    # --- In-phase batter totals from the cube (over_number is 0-based) ---
+    bp = cube.rollup(
+        "batting", by=["batter"], where={**scope_filters(region, season), "phase": phase},
+        counters=["matches", "runs", "balls", "fours", "sixes"],
+    )
+    bp["boundary_runs"] = bp["fours"] * 4 + bp["sixes"] * 6
+
+    bp["boundary_pct"] = np.where(bp["runs"] > 0, (bp["boundary_runs"] / bp["runs"]) * 100, np.nan)
+
+    # ✅ Phase stability gate (LOCKED baseline)
+    bp = bp[bp["balls"] >= 120].copy()
+    bp["match_bucket"] = _match_bucket(bp["matches"])
+    if bucket != "All":
+        bp = bp[bp["match_bucket"] == bucket]
+
+    return _ranked(bp, "boundary_pct", False, top_n)
+
+
+@memoized
+def batting_dismissals(region=None, season=None, dismissal="Caught", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters by share of dismissals of one kind (min 15 outs)."""
+    balls = _batting_balls(region, season)
+
+    # --- Batter outs table ---
+    outs = balls[(balls["is_batter_out"] == 1)].copy()
+
+    # normalize wicket kind (defensive), lower-cased for matching
+    outs["wicket_kind"] = outs["wicket_kind"].astype(str).str.strip()
+    outs["wicket_kind_norm"] = outs["wicket_kind"].str.lower()
+
+    # count outs per batter (total + chosen type)
+    dis = (
+        outs.groupby("batter", as_index=False, observed=True)
+        .agg(
+            total_outs=("batter", "size"),
+            matches=("match_id", "nunique"),
+        )
+    )
+
+    dis_target = (
+        outs[outs["wicket_kind_norm"].isin(DISMISSAL_KINDS[dismissal])]
+        .groupby("batter", as_index=False, observed=True)
+        .agg(target_outs=("batter", "size"))
+    )
+
+    dis = dis.merge(dis_target, on="batter", how="left")
+    dis["target_outs"] = dis["target_outs"].fillna(0).astype(int)
+
+    # dismissal share (% of a batter's dismissals)
+    dis["dismissal_share_pct"] = np.where(
+        dis["total_outs"] > 0,
+        (dis["target_outs"] / dis["total_outs"]) * 100,
+        np.nan
+    )
+
+    # stability gate (LOCKED baseline for dismissal patterns)
+    dis = dis[dis["total_outs"] >= 15].copy()
+    dis["match_bucket"] = _match_bucket(dis["matches"])
+    if bucket != "All":
+        dis = dis[dis["match_bucket"] == bucket]
+
+    return _ranked(dis, "dismissal_share_pct", False, top_n)
+
+
+@memoized
+def batting_matchups(region=None, season=None, bowler_kind="Spin", metric="SR", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top batters vs spin or pace by SR / runs / dot ball % (min 200 balls vs that type)."""
+    # (bowler_kind = the bowler's style code from the bowler dimension: Spin / Pace)
+    mu = cube.rollup(
+        "batting", by=["batter"], where={**scope_filters(region, season), "bowler_kind": bowler_kind},
+        counters=["matches", "runs", "balls", "dots"],
+    ).rename(columns={"dots": "dot_balls"})
+
+    mu["strike_rate"] = np.where(mu["balls"] > 0, (mu["runs"] / mu["balls"]) * 100, np.nan)
+    mu["dot_ball_pct"] = np.where(mu["balls"] > 0, (mu["dot_balls"] / mu["balls"]) * 100, np.nan)
+
+    # ✅ base stability gate (LOCKED)
+    mu = mu[mu["balls"] >= 200].copy()
+    mu["match_bucket"] = _match_bucket(mu["matches"])
+    if bucket != "All":
+        mu = mu[mu["match_bucket"] == bucket]
+
+    metric_col, _, _, invert = BATTING_MATCHUP_METRICS[metric]
+    return _ranked(mu, metric_col, invert, top_n)
+
+
+@memoized
+def _batting_seasons(region=None, season=None) -> pd.DataFrame:
+    """Season x batter runs / balls / outs / SR / average in scope (batting cube)."""
+    season_bat = cube.rollup(
+        "batting", by=["season_id", "batter"], where=scope_filters(region, season),
+        counters=["matches", "runs", "balls", "outs"],
+    )
+
+    season_bat["strike_rate"] = np.where(season_bat["balls"] > 0, (season_bat["runs"] / season_bat["balls"]) * 100, np.nan)
+    season_bat["average"] = np.where(season_bat["outs"] > 0, (season_bat["runs"] / season_bat["outs"]), np.nan)
+    return season_bat
+
+
+@memoized
+def runs_trend_batters(region=None, season=None) -> list:
+    """Top 50 batters by runs in scope (min 200 balls): the Runs Trend picker."""
+    season_bat = _batting_seasons(region, season)
+    batter_pool = (
+        season_bat.groupby("batter", as_index=False, observed=True)
+        .agg(total_runs=("runs", "sum"), total_balls=("balls", "sum"), total_matches=("matches", "sum"))
+    )
+
+    batter_pool = batter_pool[batter_pool["total_balls"] >= 200]
+    return batter_pool.sort_values("total_runs", ascending=False)["batter"].head(50).tolist()
+
+
+@memoized
+def runs_trend(region=None, season=None, batter=None) -> pd.DataFrame:
+    """One batter's season-by-season line (scope-aware)."""
+    season_bat = _batting_seasons(region, season)
+    return season_bat[season_bat["batter"] == batter].sort_values("season_id")
+
+
+@memoized
+def _deep_dive_pool(region=None, season=None) -> pd.DataFrame:
+    """Batters with 200+ balls in scope, by runs: matches / runs / balls / outs / SR / average."""
+    balls = _batting_balls(region, season)
+    batter_pool = (
+        balls.groupby("batter", as_index=False, observed=True)
+        .agg(
+            matches=("match_id", "nunique"),
+            runs=("batter_runs", "sum"),
+            balls=("is_legal_ball", "sum"),
+            outs=("is_batter_out", "sum"),
+        )
+    )
+
+    batter_pool["strike_rate"] = np.where(batter_pool["balls"] > 0, (batter_pool["runs"] / batter_pool["balls"]) * 100, np.nan)
+    batter_pool["average"] = np.where(batter_pool["outs"] > 0, (batter_pool["runs"] / batter_pool["outs"]), np.nan)
+
+    batter_pool = batter_pool[batter_pool["balls"] >= 200]
+    return batter_pool.sort_values("runs", ascending=False)
+
+
+@memoized
+def deep_dive_batters(region=None, season=None) -> list:
+    """Top 75 batters by runs in scope (min 200 balls): the Player Deep Dive picker."""
+    return _deep_dive_pool(region, season)["batter"].head(75).tolist()
+
+
+@memoized
+def batter_profile(region=None, season=None, batter=None):
+    """
+    Player Deep Dive card for one batter: the pool row (matches, runs, balls,
+    outs, strike_rate, average) plus dot_pct, boundary_pct, non_boundary_sr and
+    the phase SRs pp_sr / mid_sr / death_sr (NaN when the phase has no balls).
+    None when the batter has no row in scope.
+    """
+    pool = _deep_dive_pool(region, season)
+    p = pool[pool["batter"] == batter]
+    if p.empty:
+        return None
+    profile = p.iloc[0].to_dict()
+
+    # --- Pressure & boundary features (the batter's rows: a slice of the batter-clustered balls) ---
+    tmp = dl.load_player_balls(
+        "batter", batter, columns=BATTING_BALL_COLUMNS,
+        filters={"is_super_over": False, **scope_filters(region, season)},
+    )
+
+    boundary_runs = (tmp["is_four"] * 4 + tmp["is_six"] * 6).astype(int)
+    is_boundary_ball = (tmp["is_four"] | tmp["is_six"]).astype(int)
+
+    non_boundary_runs = tmp["batter_runs"].sum() - boundary_runs.sum()
+    non_boundary_balls = tmp["is_legal_ball"].sum() - is_boundary_ball.sum()
+
+    profile["dot_pct"] = (tmp["is_dot_ball"].sum() / max(1, tmp["is_legal_ball"].sum())) * 100
+    profile["boundary_pct"] = (boundary_runs.sum() / max(1, tmp["batter_runs"].sum())) * 100
+    profile["non_boundary_sr"] = (non_boundary_runs / max(1, non_boundary_balls)) * 100
+
+    # --- Phase SRs (phase split from the batting cube) ---
+    phase_kpi = cube.rollup(
+        "batting", by=["phase"], where={**scope_filters(region, season), "batter": batter},
+        counters=["runs", "balls"],
+    )
+    phase_kpi["sr"] = np.where(phase_kpi["balls"] > 0, (phase_kpi["runs"] / phase_kpi["balls"]) * 100, np.nan)
+
+    for key, phase_name in [("pp_sr", "Powerplay"), ("mid_sr", "Middle"), ("death_sr", "Death")]:
+        row = phase_kpi[phase_kpi["phase"] == phase_name]
+        profile[key] = np.nan if row.empty else float(row["sr"].iloc[0])
+    return profile
+
+
+# =========================================================
+# Tab 5: Bowling Analysis
+# =========================================================
+BOWLING_BALL_COLUMNS = [
+    "match_id", "season_id", "bowler", "phase",
+    # locked-rule flags, precomputed in the ball dataset (src/config.py)
+    "is_legal_ball", "bowler_runs_conceded", "is_bowler_wicket",
+    "is_dot_ball", "is_four", "is_six",
+]
+
+# Stability gates (LOCKED)
+MIN_LEGAL_BALLS = 300
+MIN_WKTS = 15
+MIN_PHASE_BALLS = 120
+MIN_STYLE_BALLS = 300
+MIN_STYLE_WKTS = 15
+
+# Rank-by option -> (column, title, x-axis title, ascending, label format)
+BOWLING_PRESSURE_METRICS = {
+    "Dot Ball % ↑": ("dot_pct", "Dot Ball %", "Dot Ball % (Higher is better)", False, ".1f"),
+    "Boundary % Conceded ↓": ("boundary_pct", "Boundary % Conceded", "Boundary % Conceded (Lower is better)", True, ".2f"),
+}
+
+# Rank-by option -> (column, ascending, x-axis title, label format)
+BOWLING_PHASE_METRICS = {
+    "Best Economy ↓": ("econ", True, "Economy (Lower is better)", ".2f"),
+    "Most Wickets ↑": ("wkts", False, "Wickets (Higher is better)", ".0f"),
+    "Dot Ball % ↑": ("dot_pct", False, "Dot Ball % (Higher is better)", ".1f"),
+}
+
+BOWLING_STYLE_METRICS = {
+    "Best Economy ↓": ("econ", True, "Economy (Lower is better)", ".2f"),
+    "Best Strike Rate ↓": ("sr", True, "Strike Rate (Balls per wicket — Lower is better)", ".1f"),
+    "Best Average ↓": ("avg", True, "Average (Runs per wicket — Lower is better)", ".1f"),
+    "Dot Ball % ↑": ("dot_pct", False, "Dot Ball % (Higher is better)", ".1f"),
+    "Most Wickets ↑": ("wkts", False, "Wickets (Higher is better)", ".0f"),
+}
+
+# Rank-by option -> (column, title); both higher = better
+BOWLING_HAUL_METRICS = {
+    "3W Hauls ↑": ("inns_3w", "3W Hauls"),
+    "4W Hauls ↑": ("inns_4w", "4W Hauls"),
+}
+
+# Style mapping (MANUAL) for Pace vs Spin Specialists; unmapped bowlers are "Unknown"
+BOWLER_STYLE_MAP = {
+    # --- Pace examples ---
+    "JJ Bumrah": "Pace",
+    "SL Malinga": "Pace",
+    "B Kumar": "Pace",
+    "DW Steyn": "Pace",
+    "DJ Bravo": "Pace",
+    "GD McGrath": "Pace",
+    "Sohail Tanvir": "Pace",
+    "SM Pollock": "Pace",
+    "DE Bollinger": "Pace",
+
+    # --- Spin examples ---
+    "Rashid Khan": "Spin",
+    "Harbhajan Singh": "Spin",
+    "SP Narine": "Spin",
+    "R Ashwin": "Spin",
+    "PP Chawla": "Spin",
+    "YS Chahal": "Spin",
+    "RA Jadeja": "Spin",
+    "M Muralitharan": "Spin",
+    "A Kumble": "Spin",
+    "DL Vettori": "Spin",
+}
+
+
+def _bowling_balls(region=None, season=None) -> pd.DataFrame:
+    # baseline: remove super overs for standard analysis
+    # ✅ locked rules (src/config.py), baked into the ball dataset at build time:
+    # - is_legal_ball: wides are not legal deliveries
+    # - bowler_runs_conceded = batter runs + wides + no-balls (byes/legbyes excluded)
+    # - is_dot_ball / is_four / is_six: legal balls only
+    # - is_bowler_wicket: excludes run out / retired hurt / obstructing the field
+    return dl.load_balls(
+        columns=BOWLING_BALL_COLUMNS,
+        filters={"is_super_over": False, **scope_filters(region, season)},
+    )
+
+
+@memoized
+def bowling_pack(region=None, season=None) -> pd.DataFrame:
+    """Bowler summary in scope: matches, legal balls, runs, wkts, dots, boundaries, econ / avg / sr / dot % + exp_bucket."""
+    # Bowler summary runs in DuckDB (same scope; locked rules = the stored ball flags)
+    pack = db.query(
+        f"""
+        SELECT
+            bowler,
+            COUNT(DISTINCT match_id)::BIGINT AS matches,
+            SUM(is_legal_ball::INTEGER)::BIGINT AS legal_balls,
+            legal_balls / 6.0 AS overs,
+            SUM(bowler_runs_conceded)::BIGINT AS runs,
+            SUM(is_bowler_wicket::INTEGER)::BIGINT AS wkts,
+            SUM(is_dot_ball::INTEGER)::BIGINT AS dots,
+            SUM(is_four::INTEGER)::BIGINT AS fours,
+            SUM(is_six::INTEGER)::BIGINT AS sixes,
+            SUM(wide_ball_runs)::BIGINT AS wide_runs,
+            SUM(no_ball_runs)::BIGINT AS noball_runs
+        FROM balls
+        WHERE {db.SCOPE_WHERE}
+        GROUP BY bowler
+        ORDER BY bowler
+        """,
+        db.scope_params(region, season),
+    )
+
+    pack["econ"] = pack["runs"] / pack["overs"]
+    pack["avg"] = np.where(pack["wkts"] > 0, pack["runs"] / pack["wkts"], np.nan)
+    pack["sr"] = np.where(pack["wkts"] > 0, pack["legal_balls"] / pack["wkts"], np.nan)
+    pack["dot_pct"] = np.where(pack["legal_balls"] > 0, (pack["dots"] / pack["legal_balls"]) * 100, np.nan)
+    pack["exp_bucket"] = pack["matches"].apply(_exp_bucket)
+    return pack
+
+
+@memoized
+def bowling_fundamentals(region=None, season=None) -> dict:
+    """Fundamentals KPI cards: mean ECON / dot % (min balls) and AVG / SR (min balls + wkts) across bowlers."""
+    pack = bowling_pack(region, season)
+    pack_gated = pack[pack["legal_balls"] >= MIN_LEGAL_BALLS]
+    pack_avg_sr = pack[(pack["legal_balls"] >= MIN_LEGAL_BALLS) & (pack["wkts"] >= MIN_WKTS)]
+
+    return {
+        "econ": pack_gated["econ"].mean() if len(pack_gated) else 0,
+        "avg": pack_avg_sr["avg"].mean() if len(pack_avg_sr) else 0,
+        "sr": pack_avg_sr["sr"].mean() if len(pack_avg_sr) else 0,
+        "dot_pct": pack_gated["dot_pct"].mean() if len(pack_gated) else 0,
+    }
+
+
+@memoized
+def top_wicket_takers(region=None, season=None, top_n=5) -> pd.DataFrame:
+    """Top-N bowlers by wickets (ties -> more legal balls), min legal balls."""
+    pack = bowling_pack(region, season)
+    pack_gated = pack[pack["legal_balls"] >= MIN_LEGAL_BALLS]
+    return pack_gated.sort_values(["wkts", "legal_balls"], ascending=[False, False]).head(top_n).copy()
+
+
+@memoized
+def bowling_pressure(region=None, season=None, metric="Dot Ball % ↑", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top-N bowlers by dot ball % or boundary % conceded (min legal balls)."""
+    pack = bowling_pack(region, season)
+    pack_pb = pack[pack["legal_balls"] >= MIN_LEGAL_BALLS].copy()
+    if bucket != "All":
+        pack_pb = pack_pb[pack_pb["exp_bucket"] == bucket].copy()
+
+    pack_pb["boundary_balls"] = pack_pb["fours"].fillna(0) + pack_pb["sixes"].fillna(0)
+    pack_pb["boundary_pct"] = np.where(
+        pack_pb["legal_balls"] > 0,
+        (pack_pb["boundary_balls"] / pack_pb["legal_balls"]) * 100,
+        0
+    )
+
+    metric_col, _, _, sort_asc, _ = BOWLING_PRESSURE_METRICS[metric]
+    plot_df = pack_pb.sort_values(metric_col, ascending=sort_asc).head(top_n).copy()
+
+    # lock order for Altair
+    plot_df["bowler_order"] = plot_df["bowler"]
+    return plot_df
+
+
+@memoized
+def phase_specialists(region=None, season=None, phase="Powerplay", metric="Best Economy ↓", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top-N bowlers in one phase by economy / wickets / dot % (min phase legal balls)."""
+    # (legal balls only -> the cube's legal_* counters)
+    phase_pack = cube.rollup(
+        "bowling", by=["phase", "bowler"], where=scope_filters(region, season),
+        counters=["legal_matches", "legal_balls", "legal_runs", "legal_wkts", "dots"],
+    ).rename(columns={"legal_matches": "matches", "legal_runs": "runs", "legal_wkts": "wkts"})
+
+    phase_pack["overs"] = phase_pack["legal_balls"] / 6
+    phase_pack["econ"] = np.where(phase_pack["overs"] > 0, phase_pack["runs"] / phase_pack["overs"], np.nan)
+    phase_pack["dot_pct"] = np.where(phase_pack["legal_balls"] > 0, (phase_pack["dots"] / phase_pack["legal_balls"]) * 100, np.nan)
+    phase_pack["exp_bucket"] = phase_pack["matches"].apply(_exp_bucket)
+
+    plot_phase = phase_pack[(phase_pack["legal_balls"] >= MIN_PHASE_BALLS) & (phase_pack["phase"] == phase)]
+    if bucket != "All":
+        plot_phase = plot_phase[plot_phase["exp_bucket"] == bucket]
+
+    metric_col, sort_asc, _, _ = BOWLING_PHASE_METRICS[metric]
+    plot_phase = plot_phase.dropna(subset=[metric_col])
+    return _ranked(plot_phase, metric_col, sort_asc, int(top_n))
+
+
+@memoized
+def wicket_hauls(region=None, season=None, metric="3W Hauls ↑", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top-N bowlers by 3W / 4W innings (ties -> more innings), min legal balls."""
+    # Innings-level wicket bursts (precomputed bowler-innings table, same Region + Season scope)
+    innings_wkts = dl.load_bowler_innings(filters={"is_super_over": False, **scope_filters(region, season)})[
+        ["match_id", "innings", "bowler", "wkts", "legal_balls"]
+    ]
+
+    # Stability: bowler must have enough total legal balls across scope
+    bowler_balls = (
+        innings_wkts.groupby("bowler", as_index=False, observed=True)
+                    .agg(total_legal_balls=("legal_balls", "sum"))
+    )
+    stable_bowlers = set(
+        bowler_balls[bowler_balls["total_legal_balls"] >= MIN_LEGAL_BALLS]["bowler"].tolist()
+    )
+    innings_wkts = innings_wkts[innings_wkts["bowler"].isin(stable_bowlers)]
+
+    # Convert to bowler-level haul counts
+    s5 = (
+        innings_wkts.groupby("bowler", as_index=False, observed=True)
+                    .agg(
+                        inns=("match_id", "count"),
+                        inns_3w=("wkts", lambda x: int((x >= 3).sum())),
+                        inns_4w=("wkts", lambda x: int((x >= 4).sum())),
+                    )
+    )
+
+    # matches + exp_bucket from the bowler pack
+    s5 = s5.merge(bowling_pack(region, season)[["bowler", "matches", "exp_bucket"]], on="bowler", how="left")
+    if bucket != "All":
+        s5 = s5[s5["exp_bucket"] == bucket]
+
+    metric_col = BOWLING_HAUL_METRICS[metric][0]
+    return _ranked(s5, [metric_col, "inns"], [False, False], int(top_n))
+
+
+@memoized
+def style_specialists(region=None, season=None, metric="Best Economy ↓", style="All styles", bucket="All", top_n=5) -> pd.DataFrame:
+    """Top-N bowlers of one manual style (Pace / Spin / Unknown) by the chosen KPI, stability gated."""
+    balls = _bowling_balls(region, season)
+    style_df = balls[balls["is_legal_ball"] == 1].copy()
+    style_df["bowling_style"] = style_df["bowler"].map(BOWLER_STYLE_MAP).fillna("Unknown")
+
+    # Build style pack (bowler-level)
+    style_pack = (
+        style_df.groupby(["bowling_style", "bowler"], as_index=False, observed=True)
+        .agg(
+            matches=("match_id", "nunique"),
+            legal_balls=("is_legal_ball", "sum"),
+            runs=("bowler_runs_conceded", "sum"),
+            wkts=("is_bowler_wicket", "sum"),
+            dots=("is_dot_ball", "sum"),
+        )
+    )
+
+    style_pack["overs"] = style_pack["legal_balls"] / 6
+    style_pack["econ"] = np.where(style_pack["overs"] > 0, style_pack["runs"] / style_pack["overs"], np.nan)
+    style_pack["dot_pct"] = np.where(style_pack["legal_balls"] > 0, (style_pack["dots"] / style_pack["legal_balls"]) * 100, np.nan)
+    style_pack["sr"] = np.where(style_pack["wkts"] > 0, style_pack["legal_balls"] / style_pack["wkts"], np.nan)
+    style_pack["avg"] = np.where(style_pack["wkts"] > 0, style_pack["runs"] / style_pack["wkts"], np.nan)
+    style_pack["exp_bucket"] = style_pack["matches"].apply(_exp_bucket)
+
+    # Average / Strike Rate also need a stable wicket count
+    df_s11 = style_pack[style_pack["legal_balls"] >= MIN_STYLE_BALLS]
+    if metric in ["Best Strike Rate ↓", "Best Average ↓"]:
+        df_s11 = df_s11[df_s11["wkts"] >= MIN_STYLE_WKTS]
+
+    if style != "All styles":
+        df_s11 = df_s11[df_s11["bowling_style"] == style]
+    if bucket != "All":
+        df_s11 = df_s11[df_s11["exp_bucket"] == bucket]
+
+    metric_col, sort_asc, _, _ = BOWLING_STYLE_METRICS[metric]
+    df_s11 = df_s11.dropna(subset=[metric_col])
+    return _ranked(df_s11, metric_col, sort_asc, int(top_n))
+
+
+@memoized
+def _bowling_seasons(region=None, season=None) -> pd.DataFrame:
+    """Season x bowler legal balls / runs / wkts / dots / econ / dot % in scope (bowling cube)."""
+    # (legal balls only -> the cube's legal_* counters)
+    bowler_season = cube.rollup(
+        "bowling", by=["season_id", "bowler"], where=scope_filters(region, season),
+        counters=["legal_matches", "legal_balls", "legal_runs", "legal_wkts", "dots"],
+    ).rename(columns={"legal_matches": "matches", "legal_runs": "runs", "legal_wkts": "wkts"})
+    bowler_season.insert(4, "overs", bowler_season["legal_balls"] / 6)
+
+    bowler_season["econ"] = np.where(bowler_season["overs"] > 0, bowler_season["runs"] / bowler_season["overs"], np.nan)
+    bowler_season["dot_pct"] = np.where(
+        bowler_season["legal_balls"] > 0,
+        (bowler_season["dots"] / bowler_season["legal_balls"]) * 100,
+        np.nan
+    )
+    return bowler_season
+
+
+@memoized
+def trend_bowlers(region=None, season=None) -> list:
+    """Top 50 bowlers by wickets (ties -> more balls) in scope, min 300 legal balls: the trend / profile picker."""
+    top50_bowlers = (
+        _bowling_seasons(region, season).groupby("bowler", as_index=False, observed=True)
+        .agg(total_wkts=("wkts", "sum"), total_balls=("legal_balls", "sum"))
+    )
+
+    # Stability gate for selection list (same logic style)
+    top50_bowlers = top50_bowlers[top50_bowlers["total_balls"] >= 300]
+
+    top50_bowlers = (
+        top50_bowlers.sort_values(["total_wkts", "total_balls"], ascending=[False, False])
+        .head(50)
+    )
+    return top50_bowlers["bowler"].tolist()
+
+
+@memoized
+def wickets_trend(region=None, season=None, bowler=None) -> pd.DataFrame:
+    """One bowler's season-by-season wickets / econ / dot % (scope-aware)."""
+    bowler_season = _bowling_seasons(region, season)
+    return bowler_season[bowler_season["bowler"] == bowler].sort_values("season_id")
+
+
+@memoized
+def bowler_profile(region=None, season=None, bowler=None) -> dict:
+    """
+    Bowler KPI Profile for one bowler (legal balls in scope): matches, legal_balls,
+    wkts, econ, avg, sr, dot_pct, boundary_pct (0 when undefined) and
+    phases = {phase: (econ, dot_pct)} for Powerplay / Middle / Death (0 when missing).
+    """
+    # the bowler's rows: a slice of the bowler-clustered balls (same rows as _bowling_balls)
+    balls = dl.load_player_balls(
+        "bowler", bowler, columns=BOWLING_BALL_COLUMNS,
+        filters={"is_super_over": False, **scope_filters(region, season)},
+    )
+    prof_legal = balls[balls["is_legal_ball"] == 1]
+
+    legal_balls = prof_legal["is_legal_ball"].sum()
+    overs = legal_balls / 6
+    runs = prof_legal["bowler_runs_conceded"].sum()
+    wkts = prof_legal["is_bowler_wicket"].sum()
+    dots = prof_legal["is_dot_ball"].sum()
+    boundary_balls = prof_legal["is_four"].sum() + prof_legal["is_six"].sum()
+
+    # phase is precomputed per ball (null outside overs 0–19)
+    phase_legal = prof_legal[prof_legal["phase"].notna()]
+    phase_pack = (
+        phase_legal.groupby("phase", as_index=False, observed=True)
+        .agg(
+            legal_balls=("is_legal_ball", "sum"),
+            overs=("is_legal_ball", lambda x: x.sum() / 6),
+            runs=("bowler_runs_conceded", "sum"),
+            wkts=("is_bowler_wicket", "sum"),
+            dots=("is_dot_ball", "sum"),
+        )
+    )
+    phase_pack["econ"] = np.where(phase_pack["overs"] > 0, phase_pack["runs"] / phase_pack["overs"], np.nan)
+    phase_pack["dot_pct"] = np.where(
+        phase_pack["legal_balls"] > 0,
+        (phase_pack["dots"] / phase_pack["legal_balls"]) * 100,
+        np.nan
+    )
+    phase_pack = phase_pack.set_index("phase")
+
+    # If some phase missing (rare), fill safely
+    def safe_get(p, col, default=0):
+        return float(phase_pack.loc[p, col]) if p in phase_pack.index and pd.notna(phase_pack.loc[p, col]) else default
+
+    return {
+        "matches": prof_legal["match_id"].nunique(),
+        "legal_balls": legal_balls,
+        "wkts": wkts,
+        "econ": (runs / overs) if overs > 0 else 0,
+        "avg": (runs / wkts) if wkts > 0 else 0,
+        "sr": (legal_balls / wkts) if wkts > 0 else 0,
+        "dot_pct": (dots / legal_balls) * 100 if legal_balls > 0 else 0,
+        "boundary_pct": (boundary_balls / legal_balls) * 100 if legal_balls > 0 else 0,
+        "phases": {p: (safe_get(p, "econ"), safe_get(p, "dot_pct")) for p in PHASE_ORDER},
+    }
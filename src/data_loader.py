@@ -1,31 +1,748 @@
 # src/data_loader.py
 
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import streamlit as st
 
+import src.perf as perf
+from src.scope_index import ScopeIndex
+from src.config import NOT_BOWLER_WKTS, PHASES, RULES_VERSION, SPIN_KEYWORDS, WRIST_SPIN_KEYWORDS
+
 # Project root: .../IPL_Strategy_Dashboard
 BASE_DIR = Path(__file__).resolve().parents[1]
-DATA_DIR = BASE_DIR / "data" / "processed_new"
 
-@st.cache_data(show_spinner=False)
+# Data tree (KPIs/ + processed_new/). IPL_DATA_ROOT points the app and the offline builds at
+# another tree with the same layout, e.g. a synthetic one from `python -m src.build_synthetic`.
+DATA_ROOT = Path(os.environ.get("IPL_DATA_ROOT") or BASE_DIR / "data").resolve()
+DATA_DIR = DATA_ROOT / "processed_new"
+BALLS_PARQUET = DATA_DIR / "master2_balls_baseline.parquet"
+
+# Every CSV under data/ packed into one Arrow IPC file (built by `python -m src.build_dataset`)
+KPI_BUNDLE = DATA_DIR / "kpi_bundle.arrow"
+KPI_BUNDLE_MAGIC = b"KPIBNDL1"
+
+# season_id= / venue_region= partitioned copy of master2 (built by `python -m src.build_dataset`)
+BALLS_PARTITIONED_DIR = DATA_DIR / "master2_balls_partitioned"
+BALL_PARTITIONING = ds.partitioning(
+    pa.schema([("season_id", pa.int16()), ("venue_region", pa.string())]),
+    flavor="hive",
+)
+
+# One row per (match_id, innings) of master2, super overs excluded (built by `python -m src.build_dataset`)
+INNINGS_PARQUET = DATA_DIR / "master_innings.parquet"
+
+# One row per (match_id, innings, over_number, bowler) of master2, super overs excluded (same builder)
+OVERS_PARQUET = DATA_DIR / "master_overs.parquet"
+
+# One row per (match_id, innings, batter), sorted by batter (built by `python -m src.build_kpis`)
+BATTER_INNINGS_PARQUET = DATA_DIR / "batter_innings.parquet"
+
+# One row per (match_id, innings, bowler) / per bowling spell, sorted by bowler (same pipeline)
+BOWLER_INNINGS_PARQUET = DATA_DIR / "bowler_innings.parquet"
+BOWLER_SPELLS_PARQUET = DATA_DIR / "bowler_spells.parquet"
+
+# One row per bowler with the style family of their bowler_type (built by `python -m src.build_dataset`)
+BOWLERS_PARQUET = DATA_DIR / "dim_bowlers.parquet"
+
+# ---------------- CSV cache ----------------
+# Process-wide LRU keyed on the resolved path. Each entry remembers the file's
+# (mtime_ns, size) and a content hash, so a regenerated KPI file is picked up on
+# the next call without a server restart, while a re-export with identical bytes
+# keeps the cached frame. Bounded by entry count and by total in-memory bytes.
+CSV_CACHE_MAX_ENTRIES = 64
+CSV_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+_csv_cache = OrderedDict()  # path -> (stat_key, digest, df, nbytes)
+_csv_cache_bytes = 0
+_csv_cache_lock = threading.Lock()
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _csv_cache_pop(key):
+    global _csv_cache_bytes
+    entry = _csv_cache.pop(key, None)
+    if entry is not None:
+        _csv_cache_bytes -= entry[3]
+
+
+def _csv_cache_put(key, stat_key, digest, df):
+    global _csv_cache_bytes
+    nbytes = int(df.memory_usage(deep=True).sum())
+    _csv_cache_pop(key)
+    _csv_cache[key] = (stat_key, digest, df, nbytes)
+    _csv_cache_bytes += nbytes
+
+    # evict least-recently-used until both bounds hold (always keep the newest entry)
+    while len(_csv_cache) > 1 and (
+        len(_csv_cache) > CSV_CACHE_MAX_ENTRIES or _csv_cache_bytes > CSV_CACHE_MAX_BYTES
+    ):
+        _csv_cache_pop(next(iter(_csv_cache)))
+
+
+# ---------------- KPI bundle ----------------
+# Layout: [Arrow IPC file per table, 64-byte aligned] [TOC json] [u64 TOC length] [magic]
+# TOC: {"tables": {"<path under data/>": {"offset", "length", "size", "digest", "rows", "columns"}}}
+# Tables are sliced out of one memory map on demand (zero-copy), so a cold start
+# opens one file and parses no CSV.
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _open_kpi_bundle(path: str, mtime_ns: int):
+    # one zero-copy buffer over the whole map; slicing it is stateless (safe across sessions)
+    buf = pa.memory_map(path, "r").read_buffer()
+    size = buf.size
+    footer = buf.slice(size - 16, 16).to_pybytes()
+    if footer[8:] != KPI_BUNDLE_MAGIC:
+        raise ValueError(f"Not a KPI bundle: {path}")
+    toc_len = int.from_bytes(footer[:8], "little")
+    toc = json.loads(buf.slice(size - 16 - toc_len, toc_len).to_pybytes())
+    return buf, toc["tables"]
+
+
+def _kpi_bundle():
+    """(mapped buffer, TOC) of the current bundle file, or None if it has not been built."""
+    try:
+        mtime_ns = KPI_BUNDLE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    # keyed on mtime: a rebuilt bundle is re-opened, the old map is dropped
+    return _open_kpi_bundle(str(KPI_BUNDLE), mtime_ns)
+
+
+def bundle_tables() -> list:
+    """Names available in the KPI bundle (paths under data/, e.g. "processed_new/tab3_venue_kpis/venue_most_used.csv")."""
+    bundle = _kpi_bundle()
+    return sorted(bundle[1]) if bundle else []
+
+
+def load_bundle_table(name: str) -> pa.Table:
+    """
+    Return one table from the KPI bundle as a zero-copy Arrow table.
+    name is the path under data/ (see bundle_tables()); ".csv" may be omitted.
+    """
+    bundle = _kpi_bundle()
+    if bundle is None:
+        raise FileNotFoundError(f"KPI bundle not built: {KPI_BUNDLE}")
+    buf, toc = bundle
+    entry = toc.get(name) or toc.get(f"{name}.csv")
+    if entry is None:
+        raise KeyError(f"Table not in KPI bundle: {name}")
+    return pa.ipc.open_file(buf.slice(entry["offset"], entry["length"])).read_all()
+
+
+def _bundle_frame(path: Path, stat):
+    """
+    The bundled copy of a CSV as a DataFrame, or None if it is missing or stale.
+    Returns (df, digest).
+    """
+    bundle = _kpi_bundle()
+    if bundle is None:
+        return None
+    try:
+        name = path.relative_to(DATA_ROOT.resolve()).as_posix()
+    except ValueError:
+        return None
+    entry = bundle[1].get(name)
+    if entry is None or entry["size"] != stat.st_size:
+        return None
+    # CSV touched after the bundle was built -> trust it only if the bytes still match
+    if stat.st_mtime_ns > KPI_BUNDLE.stat().st_mtime_ns and _file_digest(path) != entry["digest"]:
+        return None
+
+    df = load_bundle_table(name).to_pandas()
+    # Arrow hands back None for missing strings; read_csv gives NaN
+    obj_cols = [c for c in df.columns if df[c].dtype == object]
+    if obj_cols:
+        df[obj_cols] = df[obj_cols].where(df[obj_cols].notna(), np.nan)
+    return df, entry["digest"]
+
+
+@perf.timed()
 def load_csv(*parts: str) -> pd.DataFrame:
     """
     Load a CSV from data/processed_new using path parts.
+    Cached per process; a changed file (mtime/size + content hash) is re-read automatically.
+    Served from the KPI bundle when it holds an up-to-date copy of the file.
+    Returns a copy, so callers may modify it freely.
 
     Examples:
         load_csv("kpi_player_batting_alltime.csv")
-        load_csv("master2_balls_baseline.csv")
+        load_csv("master1_matches_baseline.csv")
     """
-    path = DATA_DIR.joinpath(*parts)
-    return pd.read_csv(path)
+    path = DATA_DIR.joinpath(*parts).resolve()
+    stat = path.stat()
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+
+    with _csv_cache_lock:
+        entry = _csv_cache.get(path)
+        if entry is not None and entry[0] == stat_key:
+            _csv_cache.move_to_end(path)
+            return entry[2].copy()
+
+    bundled = _bundle_frame(path, stat) if entry is None else None
+    if bundled is not None:
+        df, digest = bundled
+    else:
+        # new or touched file: only re-parse if the bytes actually changed
+        digest = _file_digest(path)
+        if entry is not None and entry[1] == digest:
+            df = entry[2]
+        else:
+            df = pd.read_csv(path)
+
+    with _csv_cache_lock:
+        _csv_cache_put(path, stat_key, digest, df)
+    return df.copy()
+
+
+def invalidate(*parts: str) -> None:
+    """
+    Drop cached CSVs: one file (same path parts as load_csv) or, with no arguments, all of them.
+
+    Examples:
+        invalidate("kpi_player_batting_alltime.csv")
+        invalidate()
+    """
+    global _csv_cache_bytes
+    with _csv_cache_lock:
+        if parts:
+            _csv_cache_pop(DATA_DIR.joinpath(*parts).resolve())
+        else:
+            _csv_cache.clear()
+            _csv_cache_bytes = 0
+
+
+def csv_cache_info() -> dict:
+    with _csv_cache_lock:
+        return {
+            "entries": len(_csv_cache),
+            "bytes": _csv_cache_bytes,
+            "max_entries": CSV_CACHE_MAX_ENTRIES,
+            "max_bytes": CSV_CACHE_MAX_BYTES,
+        }
+
+# ---------------- Ball master schema ----------------
+# Column order of master2 (see DATA_CONTRACT.md, section 8)
+BALL_COLUMNS = [
+    "match_id", "batter", "bowler", "non_striker", "team_batting", "team_bowling",
+    "over_number", "ball_number", "batter_runs", "extras", "total_runs",
+    "batsman_type", "bowler_type", "player_out", "fielders_involved",
+    "is_wicket", "is_wide_ball", "is_no_ball", "is_leg_bye", "is_bye", "is_penalty",
+    "wide_ball_runs", "no_ball_runs", "leg_bye_runs", "bye_runs", "penalty_runs",
+    "wicket_kind", "is_super_over", "innings", "season_id", "match_date", "venue", "venue_region",
+]
+
+# Canonical compact schema for master2, enforced once when the table is loaded:
+# - repeated strings -> dictionary-encoded (pandas Categorical)
+# - small counters -> int8 / int16 / int32
+# - is_* flags -> boolean (bit-packed in Arrow, 1 byte per value in pandas)
+# player_out / fielders_involved stay plain strings: they are mostly null and
+# player_out is compared against batter row-by-row.
+BALL_CATEGORY_COLS = [
+    "batter", "bowler", "non_striker",
+    "team_batting", "team_bowling",
+    "batsman_type", "bowler_type", "wicket_kind",
+    "match_date", "venue", "venue_region", "phase",
+]
+
+BALL_INT_TYPES = {
+    "match_id": pa.int32(),
+    "season_id": pa.int16(),
+    "innings": pa.int8(),
+    "over_number": pa.int8(),
+    "ball_number": pa.int8(),
+    "batter_runs": pa.int8(),
+    "extras": pa.int8(),
+    "total_runs": pa.int8(),
+    "wide_ball_runs": pa.int8(),
+    "no_ball_runs": pa.int8(),
+    "leg_bye_runs": pa.int8(),
+    "bye_runs": pa.int8(),
+    "penalty_runs": pa.int8(),
+}
+
+def _apply_ball_schema(table: pa.Table) -> pa.Table:
+    fields = []
+    for field in table.schema:
+        if field.name in BALL_CATEGORY_COLS:
+            type_ = pa.dictionary(pa.int16(), pa.string())
+        elif field.name in BALL_INT_TYPES:
+            type_ = BALL_INT_TYPES[field.name]
+        elif field.name.startswith("is_"):
+            type_ = pa.bool_()
+        else:
+            type_ = field.type
+        fields.append(pa.field(field.name, type_))
+
+    # nulls in flags / run counters mean "didn't happen"
+    for i, field in enumerate(fields):
+        if field.name.startswith("is_") or field.name in BALL_INT_TYPES:
+            col = table.column(field.name)
+            if col.null_count:
+                table = table.set_column(i, field.name, pc.fill_null(col, 0 if field.name in BALL_INT_TYPES else False))
+
+    return table.cast(pa.schema(fields))
+
+# ---------------- Derived ball flags ----------------
+# Locked rules (src/config.py) evaluated once per ball and stored next to the
+# raw columns in the partitioned master2 export, so pages select them instead
+# of re-deriving them on every rerun. Bool flags + int8 runs + dictionary phase.
+BALL_FLAG_COLUMNS = [
+    "is_legal_ball",          # not a wide
+    "is_dot_ball",            # legal and batter_runs == 0
+    "is_four",                # legal and batter_runs == 4
+    "is_six",                 # legal and batter_runs == 6
+    "is_batter_out",          # wicket and player_out == batter
+    "is_bowler_wicket",       # wicket and wicket_kind not in NOT_BOWLER_WKTS
+    "bowler_runs_conceded",   # batter_runs + wide_ball_runs + no_ball_runs
+    "phase",                  # Powerplay / Middle / Death (null outside overs 0–19)
+    "bowler_style_code",      # STYLE_* bits of bowler_type (see classify_bowler_type)
+    "is_spin_bowler",         # bowler_style_code & STYLE_SPIN
+]
+
+BALL_FLAG_SOURCE_COLUMNS = [
+    "batter", "bowler_type", "over_number", "batter_runs", "player_out",
+    "is_wicket", "wicket_kind", "is_wide_ball", "wide_ball_runs", "no_ball_runs",
+]
+
+# parquet schema metadata key holding the RULES_VERSION the flags were derived with
+BALL_RULES_VERSION_KEY = b"ipl_rules_version"
+
+# bowler_style_code bits: mask with & instead of matching bowler_type strings
+STYLE_SPIN = 1
+STYLE_WRIST = 2
+STYLE_LEFT_ARM = 4
+
+def classify_bowler_type(bowler_type) -> dict:
+    """
+    Style family of one bowler_type string ("Right arm Offbreak", "Left arm Fast medium", ...).
+
+    bowler_kind: Spin if any SPIN_KEYWORDS appears (mixed types included), else Pace.
+    spin_family: Wrist / Finger for spinners (from the first spin style listed), None for pace.
+    bowling_arm: Left / Right from the primary style; bare "Legbreak" is right-arm; Unknown if unnamed.
+    style_code: the same as STYLE_* bits.
+    """
+    text = str(bowler_type or "").lower().strip()
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    spin_parts = [p for p in parts if any(k in p for k in SPIN_KEYWORDS)]
+    primary = spin_parts[0] if spin_parts else (parts[0] if parts else "")
+
+    is_spin = bool(spin_parts)
+    is_wrist = is_spin and any(k in primary for k in WRIST_SPIN_KEYWORDS)
+    if "left" in primary:
+        arm = "Left"
+    elif "right" in primary or "legbreak" in primary:
+        arm = "Right"
+    else:
+        arm = "Unknown"
+
+    return {
+        "bowler_kind": "Spin" if is_spin else "Pace",
+        "spin_family": ("Wrist" if is_wrist else "Finger") if is_spin else None,
+        "bowling_arm": arm,
+        "style_code": STYLE_SPIN * is_spin + STYLE_WRIST * is_wrist + STYLE_LEFT_ARM * (arm == "Left"),
+    }
+
+def add_ball_flags(table: pa.Table) -> pa.Table:
+    """Append BALL_FLAG_COLUMNS to a compact-schema master2 table (needs BALL_FLAG_SOURCE_COLUMNS)."""
+    runs = table.column("batter_runs")
+    legal = pc.invert(table.column("is_wide_ball"))
+    is_wicket = table.column("is_wicket")
+
+    batter = pc.cast(table.column("batter"), pa.string())
+    wicket_kind = pc.utf8_lower(pc.cast(table.column("wicket_kind"), pa.string()))
+    # bowler_type is dictionary-encoded: classify each distinct string once, then gather by index
+    bowler_type = table.column("bowler_type").combine_chunks()
+    style_codes = pa.array(
+        [classify_bowler_type(v)["style_code"] for v in bowler_type.dictionary.to_pylist()], pa.int8()
+    )
+    style_code = pc.fill_null(pc.take(style_codes, bowler_type.indices), 0)
+
+    over = table.column("over_number")
+    phase = pa.nulls(len(table), pa.string())
+    for name, (lo, hi) in PHASES.items():
+        in_phase = pc.and_(pc.greater_equal(over, lo), pc.less_equal(over, hi))
+        phase = pc.if_else(in_phase, name, phase)
+
+    flags = {
+        "is_legal_ball": legal,
+        "is_dot_ball": pc.and_(legal, pc.equal(runs, 0)),
+        "is_four": pc.and_(legal, pc.equal(runs, 4)),
+        "is_six": pc.and_(legal, pc.equal(runs, 6)),
+        "is_batter_out": pc.and_(is_wicket, pc.fill_null(pc.equal(table.column("player_out"), batter), False)),
+        "is_bowler_wicket": pc.and_(
+            is_wicket, pc.invert(pc.is_in(wicket_kind, value_set=pa.array(sorted(NOT_BOWLER_WKTS))))
+        ),
+        "bowler_runs_conceded": pc.add(pc.add(runs, table.column("wide_ball_runs")), table.column("no_ball_runs")),
+        "phase": pc.dictionary_encode(phase),
+        "bowler_style_code": style_code,
+        "is_spin_bowler": pc.not_equal(pc.bit_wise_and(style_code, STYLE_SPIN), 0),
+    }
+    for name, col in flags.items():
+        table = table.append_column(name, col)
+    return _apply_ball_schema(table)
+
+def _ball_flags_current(dataset: ds.Dataset) -> bool:
+    """True when the dataset carries flag columns derived with the current RULES_VERSION."""
+    meta = dataset.schema.metadata or {}
+    return meta.get(BALL_RULES_VERSION_KEY) == str(RULES_VERSION).encode()
+
+def _filter_expression(filters):
+    """
+    Convert {"column": value} into a pyarrow compute expression.
+    None values are skipped (no filter); lists/tuples/sets become an isin() filter.
+    """
+    if not filters:
+        return None
+
+    expr = None
+    for col, value in filters.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple, set, frozenset)):
+            cond = pc.field(col).isin(list(value))
+        else:
+            cond = pc.field(col) == value
+        expr = cond if expr is None else (expr & cond)
+    return expr
+
+# Filters served by a ScopeIndex instead of a scan: dimension -> its column(s), constant
+# within a match ("team" = the match's two sides, i.e. either team_batting or team_bowling).
+SCOPE_DIMS = {
+    "match_id": ["match_id"],
+    "season_id": ["season_id"],
+    "venue_region": ["venue_region"],
+    "venue": ["venue"],
+    "team": ["team_batting", "team_bowling"],
+}
+SCOPE_SORT = ["season_id", "venue_region"]
+
+# ...except in the loaders, where these stay in the scan: master2 is partitioned on them
+# (and the fact files prune row groups), so a one-season read never loads the other seasons.
+SCAN_SCOPE_DIMS = ["season_id", "venue_region"]
+
+def _split_scope(filters, columns, scan=SCAN_SCOPE_DIMS):
+    """
+    filters -> (ScopeIndex part, the rest or None): SCOPE_DIMS whose columns the
+    table has, except the `scan` ones, which go with the rest into the scan.
+    """
+    scope, rest = {}, {}
+    for col, value in (filters or {}).items():
+        if value is None:
+            continue
+        if col in SCOPE_DIMS and col not in scan and set(SCOPE_DIMS[col]) <= set(columns):
+            scope[col] = value
+        else:
+            rest[col] = value
+    return scope, rest or None
+
+@st.cache_resource(show_spinner=False)
+def _source_columns(source: str) -> tuple:
+    """Column names of a loader's source ("balls" = the master2 dataset, else a parquet path)."""
+    if source == "balls":
+        return tuple(_ball_dataset().schema.names)
+    return tuple(pq.read_schema(source).names)
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _scope_index(source: str, filters=None) -> ScopeIndex:
+    """
+    ScopeIndex over the rows a loader returns for `filters` (same scan, same order),
+    built from the source's scope columns only. Shared by every session.
+    """
+    available = set(_source_columns(source))
+    dims = {d: cols for d, cols in SCOPE_DIMS.items() if set(cols) <= available}
+    needed = sorted({c for cols in dims.values() for c in cols})
+    if source == "balls":
+        table = _ball_dataset().to_table(columns=needed, filter=_filter_expression(filters))
+    else:
+        table = pq.read_table(source, columns=needed, filters=_filter_expression(filters))
+    col = table.to_pandas()
+    return ScopeIndex(
+        col["match_id"],
+        {d: [col[c] for c in cols] for d, cols in dims.items()},
+        sort_by=[d for d in SCOPE_SORT if d in dims],
+    )
+
+def _scoped(load, source: str, filters):
+    """
+    Serve the match / venue / team part of `filters` from the cached frame for the
+    other filters (`load(rest)`, season / region included) and its ScopeIndex:
+    O(selected rows), no scan. None when there is no such part.
+    """
+    scope, rest = _split_scope(filters, _source_columns(source))
+    if not scope:
+        return None
+    return _scope_index(source, rest).take(load(rest), scope)
+
+@st.cache_resource(show_spinner=False)
+def _ball_dataset() -> ds.Dataset:
+    """
+    Handle on the master2 parquet data (no rows are read here), shared by
+    every session. Prefers the season/region partitioned export and falls
+    back to the single parquet file when it has not been built.
+    """
+    if BALLS_PARTITIONED_DIR.exists():
+        return ds.dataset(BALLS_PARTITIONED_DIR, format="parquet", partitioning=BALL_PARTITIONING)
+    return ds.dataset(BALLS_PARQUET, format="parquet")
+
+def _ball_frame(table: pa.Table) -> pd.DataFrame:
+    """Compact-schema master2 table -> DataFrame (shared by load_balls and the offline builds)."""
+    df = _apply_ball_schema(table).to_pandas(split_blocks=True)
+
+    # lexical category order keeps groupby/sort output identical to plain strings
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=128)
+def load_balls(columns=None, filters=None) -> pd.DataFrame:
+    """
+    Load master2 (ball-by-ball), reading only the requested columns and rows.
+
+    Filters are pushed down into the parquet scan (season_id / venue_region
+    prune the hive partitions). Match / venue / team filters are then served
+    from the cached frame for the other filters through its ScopeIndex
+    (src/scope_index.py): O(selected rows), same rows and order as a scan;
+    categoricals keep that frame's categories. The compact schema is applied
+    before conversion to pandas.
+
+    The result is cached per (columns, filters) for the whole process and
+    is shared across sessions: treat it as READ-ONLY (filter it, or take
+    .copy(deep=False) before adding columns).
+
+    Examples:
+        load_balls(columns=["match_id", "total_runs"], filters={"is_super_over": False})
+        load_balls(filters={"season_id": 2024, "venue_region": "India"})
+        load_balls(columns=["match_id", "batter_runs"], filters={"team": "Mumbai Indians", "venue": "Wankhede Stadium, Mumbai"})
+        load_balls(columns=["bowler", "is_legal_ball", "bowler_runs_conceded"])
+
+    BALL_FLAG_COLUMNS are read as stored when the dataset was exported with the
+    current RULES_VERSION; otherwise (single-file fallback, stale export) they
+    are derived here from their source columns.
+    """
+    columns = list(columns) if columns is not None else BALL_COLUMNS + BALL_FLAG_COLUMNS
+    scoped = _scoped(lambda rest: load_balls(columns, rest), "balls", filters)
+    if scoped is not None:
+        return scoped
+    return read_ball_frame(columns, filters)
+
+def read_ball_frame(columns=None, filters=None) -> pd.DataFrame:
+    """
+    Uncached master2 read behind load_balls (same columns / filters convention and
+    flag handling), for the offline builds and the DuckDB fallback. Rows come in
+    dataset order (partition by partition when partitioned).
+    """
+    columns = list(columns) if columns is not None else BALL_COLUMNS + BALL_FLAG_COLUMNS
+    dataset = _ball_dataset()
+    flags = [c for c in columns if c in BALL_FLAG_COLUMNS]
+
+    if not flags or _ball_flags_current(dataset):
+        table = dataset.to_table(columns=columns, filter=_filter_expression(filters))
+    else:
+        raw = [c for c in columns if c not in BALL_FLAG_COLUMNS]
+        read = raw + [c for c in BALL_FLAG_SOURCE_COLUMNS if c not in raw]
+        table = dataset.to_table(columns=read, filter=_filter_expression(filters))
+        table = add_ball_flags(_apply_ball_schema(table)).select(columns)
+    return _ball_frame(table)
+
+# Player drill-downs: master2 clustered by player (batter / bowler) with an offset index
+PLAYER_COLUMNS = ["batter", "bowler"]
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _player_clusters(player_col: str, columns=None, filters=None):
+    """
+    Copy of load_balls(columns, filters) with rows grouped by `player_col`
+    (stable: table order within a player), plus bounds = {player: (start, stop)}
+    into it, the frame's ScopeIndex and each clustered row's block in it.
+    Shared by every session; READ-ONLY like load_balls.
+    """
+    df = load_balls(columns, filters)
+    codes, players = pd.factorize(df[player_col])
+    order = np.argsort(codes, kind="stable")  # null players (-1) sort first
+    counts = np.bincount(codes[codes >= 0], minlength=len(players))
+    stops = np.cumsum(counts) + np.count_nonzero(codes < 0)
+    bounds = {p: (int(b - n), int(b)) for p, n, b in zip(players, counts, stops)}
+
+    clustered = df.take(order)
+    clustered.index = pd.RangeIndex(len(clustered))
+    index = _scope_index("balls", filters)
+    return clustered, bounds, index, index.row_block[order]
+
+@perf.timed()
+def load_player_balls(player_col: str, player, columns=None, filters=None) -> pd.DataFrame:
+    """
+    One player's master2 rows (player_col = "batter" or "bowler"), same rows
+    and order as load_balls(columns, filters) filtered on the player.
+
+    The rows are a contiguous slice of a player-clustered copy (no scan, no
+    row copy); match-level filters (SCOPE_DIMS, season / region included) then
+    mask that slice through the ScopeIndex, so the cost follows the player's
+    rows, not the dataset, and one clustered copy serves every scope.
+    READ-ONLY, like load_balls.
+
+    Example:
+        load_player_balls("batter", "V Kohli", columns=["batter_runs", "is_legal_ball"],
+                          filters={"is_super_over": False, "season_id": 2016})
+    """
+    if player_col not in PLAYER_COLUMNS:
+        raise ValueError(f"player_col must be one of {PLAYER_COLUMNS}, got {player_col!r}")
+    columns = list(columns) if columns is not None else BALL_COLUMNS + BALL_FLAG_COLUMNS
+    if player_col not in columns:
+        columns.append(player_col)
+
+    scope, rest = _split_scope(filters, _source_columns("balls"), scan=())
+    clustered, bounds, index, row_block = _player_clusters(player_col, columns, rest)
+    start, stop = bounds.get(player, (0, 0))
+    rows = clustered.iloc[start:stop].copy(deep=False)
+    if scope:
+        rows = rows[index.block_mask(scope)[row_block[start:stop]]]
+    rows.index = pd.RangeIndex(len(rows))
+    return rows
 
 # ---------------- Masters ----------------
 def load_master_matches():
     return load_csv("master1_matches_baseline.csv")
 
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_master_innings(filters=None) -> pd.DataFrame:
+    """
+    Innings fact table: totals, legal balls, wickets, extras, phase runs,
+    target and result per (match_id, innings). Same filter convention and
+    READ-ONLY sharing rules as load_balls.
+
+    Example:
+        load_master_innings(filters={"season_id": 2024, "venue_region": "India"})
+    """
+    scoped = _scoped(load_master_innings, str(INNINGS_PARQUET), filters)
+    if scoped is not None:
+        return scoped
+
+    table = pq.read_table(INNINGS_PARQUET, filters=_filter_expression(filters))
+    return table.to_pandas()
+
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=64)
+def load_master_overs(filters=None) -> pd.DataFrame:
+    """
+    Over fact table: runs, wickets, dots, boundaries, extras, bowler and
+    precomputed phase (ordered categorical) per (match_id, innings, over).
+    Same filter convention and READ-ONLY sharing rules as load_balls.
+
+    Example:
+        load_master_overs(filters={"venue_region": "Overseas", "phase": "Death"})
+    """
+    scoped = _scoped(load_master_overs, str(OVERS_PARQUET), filters)
+    if scoped is not None:
+        return scoped
+
+    table = pq.read_table(OVERS_PARQUET, filters=_filter_expression(filters))
+    return table.to_pandas()
+
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=128)
+def load_batter_innings(filters=None) -> pd.DataFrame:
+    """
+    Batter-innings fact table: runs, balls, boundaries, dismissal, entry over
+    and share of team runs per (match_id, innings, batter), super-over innings
+    included (filter {"is_super_over": False} for the page rules).
+
+    Rows are sorted by batter then date, so {"batter": ...} filters read only
+    the row groups holding that batter. Same filter convention and READ-ONLY
+    sharing rules as load_balls.
+
+    Example:
+        load_batter_innings(filters={"batter": "V Kohli", "is_super_over": False})
+    """
+    scoped = _scoped(load_batter_innings, str(BATTER_INNINGS_PARQUET), filters)
+    if scoped is not None:
+        return scoped
+
+    table = pq.read_table(BATTER_INNINGS_PARQUET, filters=_filter_expression(filters))
+    return table.to_pandas()
+
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=128)
+def load_bowler_innings(filters=None) -> pd.DataFrame:
+    """
+    Bowler-innings fact table: overs, runs conceded, wickets (Tab 5 rule),
+    dots, boundaries, spell count and phase split per (match_id, innings, bowler),
+    super-over innings included. Sorted by bowler; same filter convention and
+    READ-ONLY sharing rules as load_balls.
+
+    Example:
+        load_bowler_innings(filters={"is_super_over": False, "season_id": 2024})
+    """
+    scoped = _scoped(load_bowler_innings, str(BOWLER_INNINGS_PARQUET), filters)
+    if scoped is not None:
+        return scoped
+
+    table = pq.read_table(BOWLER_INNINGS_PARQUET, filters=_filter_expression(filters))
+    return table.to_pandas()
+
+@perf.timed()
+@st.cache_resource(show_spinner=False, max_entries=128)
+def load_bowler_spells(filters=None) -> pd.DataFrame:
+    """
+    Bowler-spell fact table: one row per spell (run of a bowler's overs in an
+    innings), same counters as load_bowler_innings plus start_over / end_over.
+
+    Example:
+        load_bowler_spells(filters={"bowler": "JJ Bumrah"})
+    """
+    scoped = _scoped(load_bowler_spells, str(BOWLER_SPELLS_PARQUET), filters)
+    if scoped is not None:
+        return scoped
+
+    table = pq.read_table(BOWLER_SPELLS_PARQUET, filters=_filter_expression(filters))
+    return table.to_pandas()
+
+@perf.timed()
+@st.cache_resource(show_spinner=False)
+def load_bowler_dim() -> pd.DataFrame:
+    """
+    Bowler dimension: one row per bowler with bowler_type, bowler_kind (Spin / Pace),
+    spin_family (Finger / Wrist), bowling_arm (Left / Right / Unknown) and style_code
+    (STYLE_* bits), classified once at build time. READ-ONLY, like load_balls.
+
+    Example:
+        dim = load_bowler_dim()
+        wrist_spinners = dim.loc[(dim["style_code"] & STYLE_WRIST) != 0, "bowler"]
+    """
+    if BOWLERS_PARQUET.exists():
+        return pd.read_parquet(BOWLERS_PARQUET)
+    return build_bowler_dim(load_balls(columns=["bowler", "bowler_type"]))
+
+def build_bowler_dim(balls: pd.DataFrame) -> pd.DataFrame:
+    """Classify every (bowler, bowler_type) pair of a master2 frame; one row per bowler, sorted by bowler."""
+    pairs = (
+        balls[["bowler", "bowler_type"]].astype(str)
+        .drop_duplicates("bowler")
+        .sort_values("bowler", ignore_index=True)
+    )
+    styles = pd.DataFrame([classify_bowler_type(v) for v in pairs["bowler_type"]])
+    dim = pd.concat([pairs, styles], axis=1)
+    return dim.astype({"style_code": "int8"})
+
 def load_master_balls():
-    return load_csv("master2_balls_baseline.csv")
+    return load_balls()
 
 def load_master_teams():
     return load_csv("master3_teams.csv")
@@ -0,0 +1,146 @@
+# src/database_manager.py
+"""
+Embedded analytical SQL engine (DuckDB) over data/.
+
+Every master, dimension and KPI file is registered as a view on one
+in-process connection per server process, so pages can run leaderboard
+and venue aggregates as vectorized, multi-threaded SQL instead of
+single-threaded pandas groupbys.
+
+Views:
+    balls                 master2 + derived ball flags (the partitioned parquet when built with the current
+                          RULES_VERSION, else dl.load_balls() with the flags derived in memory)
+    innings               master_innings.parquet (one row per match + innings)
+    overs                 master_overs.parquet (one row per match + innings + over)
+    batter_innings        batter_innings.parquet (one row per match + innings + batter)
+    bowler_innings        bowler_innings.parquet (one row per match + innings + bowler)
+    bowler_spells         bowler_spells.parquet (one row per bowling spell)
+    bowlers               dim_bowlers.parquet (one row per bowler: spin / pace, finger / wrist, arm)
+    matches               master1_matches_baseline.csv
+    teams / teams_ui      master3_teams.csv / master_teams_ui.csv
+    team_aliases          master_team_aliases.csv
+    <file stem>           every other CSV / KPI parquet under data/ (e.g. kpi_player_batting_alltime, venue_most_used)
+
+Example:
+    import src.database_manager as db
+    db.query(
+        "SELECT batter, SUM(batter_runs) AS runs FROM balls WHERE season_id = $season GROUP BY batter",
+        {"season": 2024},
+    )
+"""
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+
+import src.perf as perf
+from src.data_loader import (
+    DATA_DIR,
+    DATA_ROOT,
+    BALLS_PARTITIONED_DIR,
+    BATTER_INNINGS_PARQUET,
+    BOWLER_INNINGS_PARQUET,
+    BOWLER_SPELLS_PARQUET,
+    BOWLERS_PARQUET,
+    INNINGS_PARQUET,
+    OVERS_PARQUET,
+    _ball_dataset,
+    _ball_flags_current,
+    load_balls,
+)
+
+KPI_DIR = DATA_ROOT / "KPIs"
+
+MASTER_VIEWS = {
+    "matches": DATA_DIR / "master1_matches_baseline.csv",
+    "teams": DATA_DIR / "master3_teams.csv",
+    "teams_ui": DATA_DIR / "master_teams_ui.csv",
+    "team_aliases": DATA_DIR / "master_team_aliases.csv",
+}
+
+FACT_VIEWS = {
+    "innings": INNINGS_PARQUET,
+    "overs": OVERS_PARQUET,
+    "batter_innings": BATTER_INNINGS_PARQUET,
+    "bowler_innings": BOWLER_INNINGS_PARQUET,
+    "bowler_spells": BOWLER_SPELLS_PARQUET,
+    "bowlers": BOWLERS_PARQUET,
+}
+
+
+def _sql_path(path) -> str:
+    return path.as_posix().replace("'", "''")
+
+
+def _register_views(con):
+    # ---------------- Ball master ----------------
+    # queries read the stored flag columns (is_legal_ball, is_batter_out, ...): without a
+    # current partitioned export they come from the loader, which derives them
+    if BALLS_PARTITIONED_DIR.exists() and _ball_flags_current(_ball_dataset()):
+        source = f"read_parquet('{_sql_path(BALLS_PARTITIONED_DIR)}/*/*/*.parquet', hive_partitioning = true)"
+        con.execute(f"CREATE OR REPLACE VIEW balls AS SELECT * FROM {source}")
+    else:
+        # registered objects are visible to this connection only: copy into a table the cursors share
+        # (categoricals decoded to plain strings, as read_parquet returns them)
+        table = pa.Table.from_pandas(load_balls(), preserve_index=False)
+        table = table.cast(pa.schema(
+            [pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f for f in table.schema]
+        ))
+        con.register("balls_table", table)
+        con.execute("CREATE OR REPLACE TABLE balls AS SELECT * FROM balls_table")
+        con.unregister("balls_table")
+    for name, path in FACT_VIEWS.items():
+        con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_parquet('{_sql_path(path)}')")
+
+    # ---------------- Masters / dimensions ----------------
+    for name, path in MASTER_VIEWS.items():
+        con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_csv_auto('{_sql_path(path)}')")
+
+    # ---------------- Every KPI / config file, by file stem ----------------
+    for path in sorted(list(DATA_DIR.rglob("*.csv")) + list(KPI_DIR.rglob("*.csv"))):
+        con.execute(f'CREATE OR REPLACE VIEW "{path.stem}" AS SELECT * FROM read_csv_auto(\'{_sql_path(path)}\')')
+    for path in sorted(KPI_DIR.rglob("*.parquet")):
+        con.execute(f'CREATE OR REPLACE VIEW "{path.stem}" AS SELECT * FROM read_parquet(\'{_sql_path(path)}\')')
+
+
+@st.cache_resource(show_spinner=False)
+def get_connection() -> duckdb.DuckDBPyConnection:
+    """
+    One in-memory DuckDB database per server process, with all views registered.
+    Use query() rather than this connection directly: it hands each caller its own cursor.
+    """
+    con = duckdb.connect(database=":memory:")
+    _register_views(con)
+    return con
+
+
+@perf.timed()
+def query(sql: str, params=None) -> pd.DataFrame:
+    """
+    Run a parameterized query and return a DataFrame.
+    Params are positional (`?` + list) or named (`$name` + dict); never format values into the SQL.
+    """
+    # cursors share the process-wide database but are safe to use from concurrent sessions
+    cur = get_connection().cursor()
+    try:
+        return cur.execute(sql, params).df()
+    finally:
+        cur.close()
+
+
+def list_views():
+    return query("SELECT view_name FROM duckdb_views() WHERE NOT internal ORDER BY view_name")["view_name"].tolist()
+
+
+# ---------------- Shared SQL fragments ----------------
+# Region + Season scope used by every page (NULL = All)
+SCOPE_WHERE = """
+    NOT is_super_over
+    AND ($region IS NULL OR venue_region = $region)
+    AND ($season IS NULL OR season_id = $season)
+"""
+
+
+def scope_params(region=None, season=None) -> dict:
+    return {"region": region, "season": int(season) if season is not None else None}
@@ -0,0 +1,348 @@
+# src/load_test.py
+"""
+Concurrent-session load test for pages 1–5 (run from the repo root).
+
+    python -m src.load_test                                   # 1, 2, 4, 8 sessions, 30 steps each
+    python -m src.load_test --sessions 1 8 16 32 --steps 50 --think 0.5
+    python -m src.load_test --mode process --sessions 4 8     # one process per session
+    python -m src.load_test --compare reports/benchmarks/load_<commit>.json
+
+Simulates N analysts using the app at once. Each session is a random filter walk:
+every step opens one of the pages (a session keeps its own state per page) and
+changes one thing on it (Region, Season, Show Top, a section's "Rank by", or
+switches a lazy section on), timing the rerun that follows. Walks are seeded
+(--seed), so two runs replay the same steps.
+
+    --mode thread   (default) all sessions are threads of one process, like one
+                    Streamlit server: caches (st.cache_data / st.cache_resource)
+                    and memory are shared, reruns compete for the GIL
+    --mode process  every session in its own process: nothing is shared
+                    (RSS is the sum over the processes)
+
+Each session count runs in a fresh process, after one warm-up run of every page
+(--no-warmup to measure from cold caches). Per session count it reports rerun
+latency p50 / p95 / p99, throughput (reruns/s) and RSS (after warm-up, peak under
+load). Results go to reports/benchmarks/load_<commit>.json (--out to override);
+--compare prints the change against an earlier run.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from src.bench_pages import (
+    BENCH_DIR,
+    LAZY_KEY_PREFIX,
+    REGIONS,
+    RUN_TIMEOUT,
+    TOP_CHOICES,
+    _filter,
+    _git_commit,
+    _pct,
+    _peak_rss_mb,
+    _select,
+    page_files,
+)
+
+SESSION_COUNTS = [1, 2, 4, 8]
+STEPS = 30
+RSS_SAMPLE_S = 0.2
+ACTIONS = ["region", "season", "top", "rank_by", "lazy"]
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, AttributeError):  # no procfs (macOS / Windows)
+        import psutil
+
+        return round(psutil.Process().memory_info().rss / 2**20, 1)
+
+
+class _RssSampler(threading.Thread):
+    """Peak RSS of this process while running (sampled every RSS_SAMPLE_S)."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = _rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(RSS_SAMPLE_S):
+            self.peak = max(self.peak, _rss_mb())
+
+    def stop(self) -> float:
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, _rss_mb())
+        return self.peak
+
+
+def _random_change(at, rng) -> str:
+    """Apply one random filter / section change to a page; returns what was changed."""
+    for action in rng.sample(ACTIONS, len(ACTIONS)):
+        if action == "region":
+            box = _filter(at, "Region")
+            if box is not None and _select(box, rng.choice(REGIONS)):
+                return action
+        elif action == "season":
+            box = _filter(at, "Season")
+            if box is not None:
+                box.select_index(rng.randrange(len(box.options)))
+                return action
+        elif action == "top":
+            box = _filter(at, "Top")
+            if box is not None and _select(box, rng.choice(TOP_CHOICES)):
+                return action
+        elif action == "rank_by":
+            boxes = [w for w in at.selectbox if w.label.endswith("Rank by") and w.key]
+            if boxes:
+                box = rng.choice(boxes)
+                box.select_index(rng.randrange(len(box.options)))
+                return action
+        elif action == "lazy":
+            toggles = [t for t in at.toggle if (t.key or "").startswith(LAZY_KEY_PREFIX) and not t.value]
+            if toggles:
+                rng.choice(toggles).set_value(True)
+                return action
+    return "rerun"
+
+
+def run_session(session_id, steps, seed, pages, think_s=0.0) -> list:
+    """One simulated analyst: `steps` timed reruns of a random walk over `pages`."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(f"{seed}:{session_id}")
+    files = page_files()
+    apps = {}
+    samples = []
+    for step in range(steps):
+        n = rng.choice(pages)
+        at = apps.get(n)
+        if at is None:
+            at = apps[n] = AppTest.from_file(str(files[n]), default_timeout=RUN_TIMEOUT)
+            action = "open"
+        else:
+            action = _random_change(at, rng)
+        t0 = time.perf_counter()
+        at.run(timeout=RUN_TIMEOUT)
+        samples.append({
+            "session": session_id,
+            "step": step,
+            "page": n,
+            "action": action,
+            "latency_s": round(time.perf_counter() - t0, 4),
+            "error": at.exception[0].message if at.exception else None,
+        })
+        if think_s:
+            time.sleep(think_s)
+    return samples
+
+
+def _process_session(session_id, steps, seed, pages, think_s, warmup) -> dict:
+    if warmup:
+        _warm_up(pages)
+    start = time.time()
+    samples = run_session(session_id, steps, seed, pages, think_s)
+    return {"samples": samples, "start": start, "end": time.time(), "peak_rss_mb": _peak_rss_mb()}
+
+
+def _warm_up(pages):
+    """One default run of every page: loaders and first sections cached, as on a server already in use."""
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    files = page_files()
+    for n in pages:
+        AppTest.from_file(str(files[n]), default_timeout=RUN_TIMEOUT).run(timeout=RUN_TIMEOUT)
+        # the first run re-reads the config (log level included): quiet the repeated deprecation notices after it
+        set_log_level("error")
+
+
+def _allow_concurrent_apptests():
+    """
+    AppTest assumes one run per process: each run installs a mock Runtime and patches
+    config.get_option ("global.appTest"), and undoes both when it finishes, so with
+    concurrent runs the first to finish would pull them from under the others. Keep each
+    run's Runtime (dropping the reset to None) and apply the config override once.
+    """
+    from contextlib import nullcontext
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1 import app_test
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    class _KeepInstance(type(Runtime)):
+        def __setattr__(cls, name, value):
+            if name != "_instance":
+                super().__setattr__(name, value)
+            elif value is not None:
+                Runtime._instance = value
+
+    app_test.Runtime = _KeepInstance("Runtime", (Runtime,), {})
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: nullcontext()
+
+
+def run_level(sessions, steps, seed, pages, think_s=0.0, warmup=True) -> dict:
+    """All `sessions` threads at once in this process (meant to run in a fresh worker)."""
+    _allow_concurrent_apptests()
+    if warmup:
+        _warm_up(pages)
+    rss_warm = _rss_mb()
+    sampler = _RssSampler()
+    sampler.start()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as ex:
+        futures = [ex.submit(run_session, i, steps, seed, pages, think_s) for i in range(sessions)]
+        samples = [s for f in futures for s in f.result()]
+    wall = time.perf_counter() - t0
+    return {"samples": samples, "wall_s": wall, "rss_warm_mb": rss_warm, "peak_rss_mb": sampler.stop()}
+
+
+def _quantile(values, q):
+    if not values:
+        return None
+    if len(values) == 1:
+        return round(values[0], 4)
+    return round(statistics.quantiles(values, n=100, method="inclusive")[q - 1], 4)
+
+
+def summarize(samples, wall_s) -> dict:
+    latencies = [s["latency_s"] for s in samples]
+    per_page = {}
+    for s in samples:
+        per_page.setdefault(str(s["page"]), []).append(s["latency_s"])
+    return {
+        "reruns": len(samples),
+        "errors": sum(1 for s in samples if s["error"]),
+        "wall_s": round(wall_s, 2),
+        "throughput_rps": round(len(samples) / wall_s, 3) if wall_s else None,
+        "p50_s": _quantile(latencies, 50),
+        "p95_s": _quantile(latencies, 95),
+        "p99_s": _quantile(latencies, 99),
+        "max_s": max(latencies, default=None),
+        "page_p50_s": {n: _quantile(v, 50) for n, v in sorted(per_page.items())},
+    }
+
+
+def run_load_test(session_counts=None, steps=STEPS, seed=0, pages=None, think_s=0.0, mode="thread",
+                  warmup=True) -> dict:
+    import streamlit
+
+    files = page_files()
+    pages = pages or sorted(files)
+    session_counts = session_counts or SESSION_COUNTS
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "mode": mode,
+            "steps": steps,
+            "seed": seed,
+            "pages": pages,
+            "think_s": think_s,
+            "warmup": warmup,
+        },
+        "levels": {},
+    }
+    ctx = mp.get_context("spawn")
+    for n in session_counts:
+        if mode == "thread":
+            # one fresh process per session count: caches and RSS start from the same point
+            with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+                level = ex.submit(run_level, n, steps, seed, pages, think_s, warmup).result()
+        else:
+            with ProcessPoolExecutor(max_workers=n, mp_context=ctx) as ex:
+                futures = [ex.submit(_process_session, i, steps, seed, pages, think_s, warmup) for i in range(n)]
+                runs = [f.result() for f in futures]
+            level = {
+                "samples": [s for r in runs for s in r["samples"]],
+                # first timed rerun to last (process start-up and warm-up excluded)
+                "wall_s": max(r["end"] for r in runs) - min(r["start"] for r in runs),
+                "rss_warm_mb": None,
+                "peak_rss_mb": round(sum(r["peak_rss_mb"] for r in runs), 1),
+            }
+        summary = summarize(level["samples"], level["wall_s"])
+        summary.update(rss_warm_mb=level["rss_warm_mb"], peak_rss_mb=level["peak_rss_mb"])
+        result["levels"][str(n)] = {"summary": summary, "samples": level["samples"]}
+        print(f"✅ {n} session(s): {summary['reruns']} reruns, p50 {summary['p50_s']}s, "
+              f"p95 {summary['p95_s']}s, p99 {summary['p99_s']}s, {summary['throughput_rps']} reruns/s, "
+              f"peak RSS {summary['peak_rss_mb']} MB")
+        if summary["errors"]:
+            print(f"⚠️ {n} session(s): {summary['errors']} reruns raised an exception")
+    return result
+
+
+def print_table(result):
+    print(f"{'sessions':>8} {'p50_s':>8} {'p95_s':>8} {'p99_s':>8} {'reruns/s':>9} {'rss_warm':>9} {'rss_peak':>9}")
+    for n, level in result["levels"].items():
+        s = level["summary"]
+        print(f"{n:>8} {s['p50_s']!s:>8} {s['p95_s']!s:>8} {s['p99_s']!s:>8} {s['throughput_rps']!s:>9} "
+              f"{s['rss_warm_mb']!s:>9} {s['peak_rss_mb']!s:>9}")
+
+
+def compare(baseline: dict, current: dict):
+    """Print the change of every summary number per session count (current vs baseline)."""
+    print(f"Baseline {baseline['meta']['commit']}  ->  current {current['meta']['commit']}")
+    for n, level in current["levels"].items():
+        old = baseline["levels"].get(n)
+        if old is None:
+            print(f"{n} session(s): not in baseline")
+            continue
+        o, c = old["summary"], level["summary"]
+        print(f"{n} session(s)")
+        for key in ["p50_s", "p95_s", "p99_s", "throughput_rps", "peak_rss_mb"]:
+            print(f"  {key:<16} {o.get(key)} -> {c.get(key)}  ({_pct(o.get(key), c.get(key))})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test pages 1–5 with concurrent simulated sessions.")
+    parser.add_argument("--sessions", nargs="+", type=int, metavar="N",
+                        help=f"Session counts to run (default: {' '.join(map(str, SESSION_COUNTS))}).")
+    parser.add_argument("--steps", type=int, default=STEPS, help=f"Reruns per session (default: {STEPS}).")
+    parser.add_argument("--seed", type=int, default=0, help="Random walk seed (default: 0).")
+    parser.add_argument("--pages", nargs="+", type=int, choices=[1, 2, 3, 4, 5], help="Pages to walk (default: all).")
+    parser.add_argument("--think", type=float, default=0.0, help="Seconds a session waits between reruns (default: 0).")
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread",
+                        help="Sessions as threads of one process (default) or one process each.")
+    parser.add_argument("--no-warmup", action="store_true", help="Start every session count from cold caches.")
+    parser.add_argument("--out", help="Output JSON (default: reports/benchmarks/load_<commit>.json).")
+    parser.add_argument("--compare", metavar="BASELINE", help="Baseline JSON to compare the new results against.")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    result = run_load_test(args.sessions, args.steps, args.seed, args.pages, args.think, args.mode,
+                           warmup=not args.no_warmup)
+    print_table(result)
+
+    out = args.out or BENCH_DIR / f"load_{result['meta']['commit']}.json"
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=1, ensure_ascii=False)
+    print(f"✅ Wrote {out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+    print(f"Done in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
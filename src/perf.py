@@ -0,0 +1,272 @@
+# src/perf.py
+"""
+Per-section timing and memory instrumentation for the pages.
+
+    import src.perf as perf
+
+    perf.begin_page("Batting")                  # top of the page: starts this run's trace
+    with perf.section("Batting summary"):       # any block of the page
+        ...
+    @perf.timed("Top batters")                  # or a whole function (fragments, loaders)
+    def top_batters_section(scope, top_n): ...
+    perf.debug_sidebar()                        # bottom of the page
+
+Every span records its wall time, self time (wall minus the spans nested in it:
+for a section that is widgets + chart serialization), rows in / out and, when
+memory tracing is on, the bytes it allocated (net and peak). Section
+computations (du.memoized), the dataset loaders, cube rollups and DuckDB
+queries are timed spans already, so a section's breakdown separates load,
+compute and render.
+
+Open a page with ?debug=1 for a sortable breakdown in the sidebar; memory
+tracing (tracemalloc) is on only for those runs, since it slows every
+allocation. It stays on while any ?debug=1 run is in progress: debug runs are
+counted, so one session never stops it under another's spans. Being
+process-wide, it also counts other sessions' allocations made meanwhile, and
+with several debug sessions at once the peaks are unreliable too (every span
+resets the one process-wide peak).
+IPL_PERF_TRACE=<file.jsonl> appends every page run's spans to that file; with
+?debug=1 the sidebar has a button to append the run it shows.
+
+Outside a Streamlit script run (offline builds) or before begin_page(), spans
+are not recorded and cost one context lookup.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+TRACE_FILE = Path(__file__).resolve().parents[1] / "reports" / "traces" / "perf_trace.jsonl"
+TRACE_ENV = "IPL_PERF_TRACE"
+
+_STATE_KEY = "_perf_trace"
+_SHOWN_KEY = "_perf_shown"  # run id -> JSONL lines of the trace shown in the sidebar
+_DUMPED_KEY = "_perf_dumped"  # (run id, path) of the last sidebar dump
+
+# ?debug=1 runs currently holding tracemalloc on (process-wide, shared by sessions)
+_memory_runs = 0
+_memory_lock = threading.Lock()
+
+SPAN_COLUMNS = ["name", "parent", "depth", "wall_ms", "self_ms", "rows_in", "rows_out", "alloc_kb", "peak_kb"]
+
+
+class _Trace:
+    """Spans of one page run (kept in the session, so fragment reruns add to it)."""
+
+    def __init__(self, page: str, memory: bool):
+        self.page = page
+        self.run = uuid.uuid4().hex[:12]
+        self.started = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+        self.t0 = time.perf_counter()
+        self.memory = memory
+        self.spans = []
+        self.stack = []
+
+
+class _Span:
+    __slots__ = ("name", "parent", "depth", "t0", "child_s", "child_rows", "rows_in", "rows_out", "mem0", "peak")
+
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.child_s = 0.0
+        self.child_rows = 0
+        self.rows_in = None
+        self.rows_out = None
+        self.peak = 0
+
+    def rows(self, rows_in=None, rows_out=None):
+        """Set the rows that went into / came out of this span (defaults: nested outputs / result length)."""
+        if rows_in is not None:
+            self.rows_in = int(rows_in)
+        if rows_out is not None:
+            self.rows_out = int(rows_out)
+
+
+def _current():
+    if get_script_run_ctx() is None:
+        return None
+    return st.session_state.get(_STATE_KEY)
+
+
+def debug_enabled() -> bool:
+    return st.query_params.get("debug") == "1"
+
+
+def _hold_memory():
+    """Count one more debug run; the first one starts tracemalloc."""
+    global _memory_runs
+    with _memory_lock:
+        _memory_runs += 1
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def _release_memory(trace):
+    """End `trace`'s memory tracing; the last debug run out stops tracemalloc."""
+    global _memory_runs
+    with _memory_lock:
+        if not trace.memory:
+            return
+        trace.memory = False
+        _memory_runs -= 1
+        if _memory_runs == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+def begin_page(page: str):
+    """Start this run's trace (memory tracing with ?debug=1)."""
+    previous = st.session_state.get(_STATE_KEY)
+    if previous is not None:
+        _release_memory(previous)  # a debug run that ended early (st.stop) still holds it
+    memory = debug_enabled()
+    if memory:
+        _hold_memory()
+    st.session_state[_STATE_KEY] = _Trace(page, memory)
+
+
+def _row_count(obj):
+    """Rows of a frame / series / Arrow table; None for anything else (column lists, scalars)."""
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return len(obj)
+    num_rows = getattr(obj, "num_rows", None)  # pyarrow tables
+    return num_rows if isinstance(num_rows, int) else None
+
+
+@contextmanager
+def section(name: str):
+    """Time a block as one span; yields the span (span.rows(...) to set row counts)."""
+    trace = _current()
+    if trace is None:
+        yield _Span(name, None)
+        return
+
+    parent = trace.stack[-1] if trace.stack else None
+    span = _Span(name, parent)
+    memory = trace.memory and tracemalloc.is_tracing()  # released in fragment reruns after the page run
+    if memory:
+        cur, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent.peak = max(parent.peak, peak)  # the reset below would lose the parent's peak so far
+        span.mem0 = cur
+        tracemalloc.reset_peak()
+    trace.stack.append(span)
+    span.t0 = time.perf_counter()
+    try:
+        yield span
+    finally:
+        wall = time.perf_counter() - span.t0
+        trace.stack.pop()
+        record = {
+            "name": name,
+            "parent": parent.name if parent is not None else None,
+            "depth": span.depth,
+            "start_ms": round((span.t0 - trace.t0) * 1000, 2),
+            "wall_ms": round(wall * 1000, 2),
+            "self_ms": round((wall - span.child_s) * 1000, 2),
+            "rows_in": span.rows_in if span.rows_in is not None else (span.child_rows or None),
+            "rows_out": span.rows_out,
+            "alloc_kb": None,
+            "peak_kb": None,
+        }
+        if memory and tracemalloc.is_tracing():  # None rather than garbage if it stopped meanwhile
+            cur, peak = tracemalloc.get_traced_memory()
+            span.peak = max(span.peak, peak)
+            record["alloc_kb"] = round((cur - span.mem0) / 1024, 1)
+            record["peak_kb"] = round((span.peak - span.mem0) / 1024, 1)
+        if parent is not None:
+            parent.child_s += wall
+            parent.child_rows += span.rows_out or 0
+            parent.peak = max(parent.peak, span.peak)
+        trace.spans.append(record)
+
+
+def timed(name=None):
+    """Decorator: time every call as a span named `name` (default: module.function); rows out = len(result)."""
+    def decorate(func):
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current() is None:
+                return func(*args, **kwargs)
+            with section(label) as span:
+                rows_in = next((n for n in map(_row_count, args) if n is not None), None)
+                result = func(*args, **kwargs)
+                span.rows(rows_in=rows_in, rows_out=_row_count(result))
+                return result
+
+        return wrapper
+
+    return decorate
+
+
+def spans() -> pd.DataFrame:
+    """This run's spans, in completion order (empty outside a traced run)."""
+    trace = _current()
+    return pd.DataFrame(trace.spans if trace is not None else [], columns=["start_ms"] + SPAN_COLUMNS)
+
+
+def _lines(trace):
+    return [{"page": trace.page, "run": trace.run, "started": trace.started, **record} for record in trace.spans]
+
+
+def _append(lines, path=None) -> Path:
+    path = Path(path or os.environ.get(TRACE_ENV) or TRACE_FILE)
+    if lines:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return path
+
+
+def dump_jsonl(path=None) -> Path:
+    """Append this run's spans to a JSONL file (one line per span, tagged with page / run / time)."""
+    trace = _current()
+    return _append(_lines(trace) if trace is not None else [], path)
+
+
+def _dump_shown(run):
+    """Sidebar button callback: append the run the sidebar showed (the click reruns the page first)."""
+    lines = st.session_state.get(_SHOWN_KEY, {}).get(run, [])
+    st.session_state[_DUMPED_KEY] = (run, _append(lines))
+
+
+def debug_sidebar():
+    """End of page: dump the trace if IPL_PERF_TRACE is set; with ?debug=1 show the breakdown in the sidebar."""
+    trace = _current()
+    if trace is None:
+        return
+    if os.environ.get(TRACE_ENV):
+        dump_jsonl()
+    if not trace.memory:
+        return
+
+    df = spans().drop(columns=["start_ms"]).sort_values("wall_ms", ascending=False)
+    total_ms = (time.perf_counter() - trace.t0) * 1000
+    with st.sidebar:
+        st.markdown("### ⏱️ Performance trace")
+        st.caption(
+            f"{trace.page} · run {trace.run} · {total_ms:,.0f} ms total · "
+            "self = time outside nested spans (widgets, charts) · click a header to sort"
+        )
+        st.dataframe(df, hide_index=True, use_container_width=True)
+        st.session_state[_SHOWN_KEY] = {trace.run: _lines(trace)}
+        st.button("💾 Append trace to JSONL", key="perf_dump_trace", on_click=_dump_shown, args=(trace.run,))
+        dumped = st.session_state.pop(_DUMPED_KEY, None)
+        if dumped is not None:
+            st.caption(f"Appended run {dumped[0]} to {dumped[1]}")
+    _release_memory(trace)
@@ -0,0 +1,125 @@
+# src/scope_index.py
+"""
+Match-level row index for the fact tables (master2 balls, innings, overs, player innings).
+
+Scoping a table by region / season / venue / team used to mean a boolean mask
+(or a parquet scan) over every row. A ScopeIndex resolves the same filters in
+O(selected rows):
+
+    blocks      rows are grouped into blocks (one per match); `order` is a stable
+                permutation of the rows sorted by block, blocks sorted by
+                `sort_by` (season, region, ...), and offsets[b]:offsets[b + 1]
+                are block b's rows inside `order`
+    bitmaps     per dimension, value -> the blocks holding it (CSR lists, so a
+                bitmap costs O(matching blocks)); a filter is the AND of one
+                bitmap per dimension (lists of values OR their bitmaps)
+
+Selected blocks become runs of `order` (adjacent blocks merge, so a season or a
+season + region is one run), and the positions are put back in table order:
+the rows come out exactly as a filter over the table would return them.
+
+A dimension may span several columns ("team" = team_batting or team_bowling):
+a block matches when any of its rows holds the value in any of them.
+
+Example:
+    idx = ScopeIndex(
+        balls["match_id"],
+        {"season_id": [balls["season_id"]], "team": [balls["team_batting"], balls["team_bowling"]]},
+        sort_by=["season_id"],
+    )
+    rows = idx.take(balls, {"season_id": 2024, "team": "Mumbai Indians"})
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _factorize(columns):
+    """Codes of one or more columns over a shared value index (categoricals factorize on their codes)."""
+    parts = [pd.factorize(pd.Series(c)) for c in columns]
+    values = pd.Index(parts[0][1])
+    for _, uniques in parts[1:]:
+        values = values.append(pd.Index(uniques)).drop_duplicates()
+    codes = [
+        codes if i == 0 else np.where(codes >= 0, values.get_indexer(pd.Index(uniques))[codes], -1)
+        for i, (codes, uniques) in enumerate(parts)
+    ]
+    return np.concatenate(codes), values
+
+
+class ScopeIndex:
+    """Block (match) row ranges + per-dimension block bitmaps over one table."""
+
+    def __init__(self, blocks, dims: dict, sort_by=()):
+        block_codes, block_keys = pd.factorize(pd.Series(blocks))
+        self.n_rows = len(block_codes)
+        self.n_blocks = len(block_keys)
+
+        # block order: by the first row's `sort_by` values, then first appearance
+        first_row = np.unique(block_codes, return_index=True)[1]
+        keys = [np.arange(self.n_blocks)]
+        for name in reversed(list(sort_by)):
+            codes = pd.factorize(pd.Series(dims[name][0]), sort=True)[0]
+            keys.append(codes[first_row])
+        rank = np.empty(self.n_blocks, dtype=np.int64)
+        rank[np.lexsort(keys)] = np.arange(self.n_blocks)
+
+        row_block = rank[block_codes]
+        pos_dtype = np.int32 if self.n_rows < 2**31 else np.int64
+        self.row_block = row_block.astype(np.int32)  # row -> block (to scope rows kept in another order)
+        self.order = np.argsort(row_block, kind="stable").astype(pos_dtype)
+        self.offsets = np.zeros(self.n_blocks + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_block, minlength=self.n_blocks), out=self.offsets[1:])
+
+        self.dims = {name: self._dim_lists(row_block, columns) for name, columns in dims.items()}
+
+    def _dim_lists(self, row_block, columns):
+        """value -> sorted block list (CSR: values, value offsets, blocks)."""
+        codes, values = _factorize(columns)
+        rows = np.tile(row_block, len(columns))
+        keep = codes >= 0  # nulls are never matched (None = no filter)
+        pairs = np.unique(codes[keep].astype(np.int64) * self.n_blocks + rows[keep])
+        value_offsets = np.searchsorted(pairs // self.n_blocks, np.arange(len(values) + 1))
+        return pd.Index(values), value_offsets, pairs % self.n_blocks
+
+    def bitmap(self, name: str, value) -> np.ndarray:
+        """Boolean array over blocks: blocks holding `value` (or any of a list of values) in dimension `name`."""
+        values, value_offsets, blocks = self.dims[name]
+        wanted = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+        mask = np.zeros(self.n_blocks, dtype=bool)
+        for code in values.get_indexer(wanted):
+            if code >= 0:
+                mask[blocks[value_offsets[code]:value_offsets[code + 1]]] = True
+        return mask
+
+    def block_mask(self, filters: dict) -> np.ndarray:
+        """Boolean array over blocks matching every {dim: value} filter (None values are skipped)."""
+        mask = np.ones(self.n_blocks, dtype=bool)
+        for name, value in filters.items():
+            if value is not None:
+                mask &= self.bitmap(name, value)
+        return mask
+
+    def positions(self, filters: dict) -> np.ndarray:
+        """Sorted row positions matching every {dim: value} filter (None values are skipped)."""
+        selected = np.flatnonzero(self.block_mask(filters))
+        if len(selected) == 0:
+            return np.empty(0, dtype=self.order.dtype)
+
+        starts, stops = self.offsets[selected], self.offsets[selected + 1]
+        breaks = np.flatnonzero(starts[1:] != stops[:-1]) + 1
+        run_starts = starts[np.r_[0, breaks]]
+        run_stops = stops[np.r_[breaks - 1, len(selected) - 1]]
+        pos = np.concatenate([self.order[a:b] for a, b in zip(run_starts, run_stops)])
+        pos.sort()
+        return pos
+
+    def take(self, frame: pd.DataFrame, filters: dict) -> pd.DataFrame:
+        """Rows of `frame` (the indexed table) matching `filters`, in table order, with a fresh RangeIndex."""
+        pos = self.positions(filters)
+        if len(pos) and pos[-1] - pos[0] + 1 == len(pos):
+            out = frame.iloc[pos[0]:pos[-1] + 1].copy(deep=False)  # one contiguous run: no row copy
+        else:
+            out = frame.take(pos)
+        out.index = pd.RangeIndex(len(out))
+        return out
@@ -95,6 +95,14 @@ def metric_tile(value, explanation, value_color="#111"):
         unsafe_allow_html=True
     )
 
+def lazy_section(key, label):
+    # below-the-fold sections compute only once switched on (state kept for the session);
+    # their numbers are memoized, so switching back on is a cache hit
+    if st.toggle(f"⏳ Load {label}", value=False, key=key):
+        return True
+    st.caption(f"{label} is computed on request — switch it on to load.")
+    return False
+
 def nav_buttons(back_page=None, next_page=None):
     c1, c2, c3 = st.columns([1.2, 1.2, 1.2])
 